@@ -1,20 +1,26 @@
-import shutil
 import asyncio
-import threading
+import json
 import sys
-from typing import Any, Optional, Union, List, Literal
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Union, List, Iterable, Tuple
 from agentscope.agent import ReActAgent
-from agentscope.message import Msg, AudioBlock
+from agentscope.message import Msg, AudioBlock, ToolResultBlock
 from agentscope.tool import Toolkit
 from agentscope.memory import MemoryBase
 from agentscope.formatter import FormatterBase
-from prompt_toolkit import print_formatted_text, HTML
 
 # Import display manager from the new display module
-from passion.display import StreamDisplayManager, DisplayStyles, MessageDisplayHandler
+from passion.display import StreamDisplayManager, MessageDisplayHandler
 
 # The StreamDisplayManager and other display classes are now imported from passion.display
 
+# Minimum number of seconds between explicit stdout flushes while a message is streaming
+_FLUSH_INTERVAL = 0.03
+
+# Maximum number of tool results kept for reuse by cacheable tools
+_MAX_CACHED_TOOL_RESULTS = 32
+
 
 class PassionAgent(ReActAgent):
     def __init__(
@@ -26,6 +32,8 @@ class PassionAgent(ReActAgent):
         formatter: FormatterBase = None,
         memory: MemoryBase = None,
         max_iters: int = 500, # Expose and default to a higher limit
+        quiet: bool = False, # Disable all console output, e.g. for batch workloads
+        cacheable_tools: Iterable[str] = (), # Read-only tools whose results may be reused
     ):
         super().__init__(
             name=name,
@@ -38,91 +46,174 @@ class PassionAgent(ReActAgent):
         )
         self.toolkit = toolkit
 
+        if quiet:
+            self.set_console_output_enabled(False)
+
+        # System message built once and reused for every prompt this class assembles itself
+        self._sys_msg = Msg("system", sys_prompt, "system")
+
         # Add display manager for dynamic rich displays
         self.display_manager = StreamDisplayManager()
 
         # Add message display handler to manage all display logic
         self.display_handler = MessageDisplayHandler(self.display_manager, name=name)
 
-    async def _reasoning(self, tool_choice: Union[Literal["auto", "none", "required"], None] = None):
+        # Time of the last explicit stdout flush, used to coalesce flushes while streaming
+        self._last_flush = 0.0
+
+        # Number of messages in memory, refreshed after every call and observe so get_status
+        # never walks it
+        self._msg_count = 0
+
+        # Outputs of cacheable tools keyed by (tool name, canonical JSON input), in LRU order
+        self._cacheable_tools = frozenset(cacheable_tools)
+        self._tool_cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    async def _refresh_msg_count(self) -> None:
         """
-        Override _reasoning method to support streaming output by sending intermediate messages to print
+        Re-reads the memory size into _msg_count, whoever added the messages (user input,
+        tool results, hints, summaries, interrupt replies).
         """
-        # Call the parent _reasoning method to get the response
-        response = await super()._reasoning(tool_choice)
+        self._msg_count = await self.memory.size()
+
+    async def __call__(self, *args, **kwargs) -> Msg:
+        """
+        Override __call__ to refresh the message count once the reply (or its interrupt
+        handling) has finished.
+        """
+        try:
+            return await super().__call__(*args, **kwargs)
+        finally:
+            await self._refresh_msg_count()
+
+    async def reply_batch(self, msgs: List[Msg], max_concurrency: int = 4) -> List[Msg]:
+        """
+        Answers several independent messages concurrently, one single-shot LLM call each.
+        The agent's memory is neither read nor updated, and tool calls in the responses
+        are returned to the caller rather than executed.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) # Respect the provider's rate limits
+        tools = self.toolkit.get_json_schemas() if self.toolkit else None
+
+        async def _reply_one(msg: Msg) -> Msg:
+            async with semaphore:
+                prompt = await self.formatter.format(msgs=[self._sys_msg, msg])
+                res = await self.model(prompt, tools=tools)
 
-        # Print the response immediately for streaming output
-        await self.print(response, last=False)
+                if self.model.stream:
+                    # Streamed chunks carry the accumulated content, so keep the last one
+                    content = []
+                    async for chunk in res:
+                        content = chunk.content
+                else:
+                    content = res.content
 
-        return response
+            return Msg(name=self.name, content=list(content), role="assistant")
+
+        return list(await asyncio.gather(*(_reply_one(msg) for msg in msgs)))
+
+    async def reply(self, *args, **kwargs) -> Msg:
+        """
+        Override reply method to start every reply with an empty tool-result cache,
+        since the user may have changed files or plans in between.
+        """
+        self._tool_cache.clear()
+        return await super().reply(*args, **kwargs)
 
     async def _acting(self, tool_call: dict):
         """
         Override _acting method to support streaming output for tool execution results
         """
-        # Print tool execution in progress
-        tool_name = tool_call.get("name", "unknown")
-
-        # Create a temporary message for the tool usage
-        temp_msg = Msg(
-            name=self.name,
-            role="assistant",
-            content=[{
-                "type": "tool_use",
-                "id": tool_call.get("id", ""),
-                "name": tool_name,
-                "input": tool_call.get("arguments", {})
-            }]
-        )
+        if tool_call.get("name") in self._cacheable_tools:
+            run_tool = self._acting_cached
+        else:
+            # Any other tool may change the state the cached results were read from
+            self._tool_cache.clear()
+            run_tool = super()._acting
 
-        # Print the tool usage as it happens
-        await self.print(temp_msg, last=False)
-
-        # Call the parent _acting method to execute the tool
-        result = await super()._acting(tool_call)
-
-        # Create a message for the tool result
-        result_msg = Msg(
-            name=self.name,
-            role="assistant",
-            content=[{
-                "type": "tool_result",
-                "id": tool_call.get("id", ""),
-                "name": tool_name,
-                "output": result
-            }]
-        )
+        if self._disable_console_output:
+            return await run_tool(tool_call)
 
-        # Print the tool result as soon as it's available
-        await self.print(result_msg, last=False)
+        # Show the tool usage as it happens, straight from the tool call block
+        self.display_handler.emit_tool_use(tool_call)
+
+        # Execute the tool (or reuse its cached result)
+        result = await run_tool(tool_call)
+
+        # Show the tool result as soon as it's available
+        self.display_handler.emit_tool_result(tool_call.get("id", ""), tool_call.get("name", "unknown"), result)
 
         return result
 
-    async def _observe(self, msgs: Union[Msg, List[Msg]]) -> None:
+    async def _acting_cached(self, tool_call: dict) -> None:
+        """
+        Runs a cacheable tool like ReActAgent._acting does, but reuses the output of an
+        identical earlier call instead of executing the tool again.
         """
-        Override _observe method to handle tool results as they arrive
+        key = (tool_call["name"], json.dumps(tool_call.get("input", {}), sort_keys=True, default=str))
+        show = not self._disable_console_output
+        tool_res_msg = Msg(
+            "system",
+            [ToolResultBlock(type="tool_result", id=tool_call["id"], name=tool_call["name"], output=[])],
+            "system",
+        )
+        try:
+            if key in self._tool_cache:
+                self._tool_cache.move_to_end(key)
+                # Tools may return a plain string; only a list of blocks needs its own copy
+                output = self._tool_cache[key]
+                tool_res_msg.content[0]["output"] = output if isinstance(output, str) else list(output)
+                if show:
+                    await self.print(tool_res_msg, True)
+                return None
+
+            tool_res = await self.toolkit.call_tool_function(tool_call)
+            async for chunk in tool_res:
+                tool_res_msg.content[0]["output"] = chunk.content
+                if show:
+                    await self.print(tool_res_msg, chunk.is_last)
+
+                # Let handle_interrupt deal with the interruption, and don't cache partial output
+                if chunk.is_interrupted:
+                    raise asyncio.CancelledError()
+
+            self._tool_cache[key] = tool_res_msg.content[0]["output"]
+            if len(self._tool_cache) > _MAX_CACHED_TOOL_RESULTS:
+                self._tool_cache.popitem(last=False)
+            return None
+
+        finally:
+            # Record the tool result message in the memory, cached or not
+            await self.memory.add(tool_res_msg)
+
+    async def observe(self, msg: Union[Msg, List[Msg], None]) -> None:
+        """
+        Override observe method to display observed messages before they are stored in memory
         """
-        # First print the incoming messages before processing them
-        if msgs:
-            if isinstance(msgs, list):
-                for msg in msgs:
-                    await self.print(msg, last=False)
-            else:
-                await self.print(msgs, last=False)
+        if msg:
+            # Normalize once: a single message becomes a one-element tuple (no list allocation)
+            msg_seq = msg if isinstance(msg, (list, tuple)) else (msg,)
+            # Observed messages are complete: last=True flushes their text, releases their
+            # display state and marks where each one ends, as for any other finished message
+            for m in msg_seq:
+                await self.print(m, last=True)
 
-        # Then call parent's _observe to process them in memory
-        result = super()._observe(msgs)
-        if asyncio.iscoroutine(result):
-            await result
+        await super().observe(msg)
+        await self._refresh_msg_count()
 
     def get_status(self) -> dict:
         """
         Returns the status of the agent.
         """
-        status = super().get_status()
-        status["messages_processed"] = self.memory.total_len
-        status["tools_registered"] = len(self.toolkit.get_json_schemas()) if self.toolkit else 0
-        return status
+        # Plain attribute reads only (ReActAgent has no get_status to extend), so this is
+        # cheap enough to poll
+        return {
+            "name": self.name,
+            "model": getattr(self.model, "model_name", type(self.model).__name__),
+            "messages_processed": self._msg_count,
+            # Count the registered tools directly instead of generating their JSON schemas
+            "tools_registered": len(self.toolkit.tools) if self.toolkit else 0,
+        }
 
     async def print(
         self,
@@ -131,22 +222,19 @@ class PassionAgent(ReActAgent):
         speech: Optional[Union[AudioBlock, List[AudioBlock]]] = None,
     ) -> None:
         """
-        Custom print method for better CLI UX using prompt_toolkit for styling.
+        Custom print method for better CLI UX using rich for styling.
         """
         # We only care about printing to console here.
         if self._disable_console_output:
             return
 
-        # Use the display handler to manage all display logic
-        self.display_handler.handle_tool_use_display(msg, last)
-        self.display_handler.handle_tool_result_display(msg)
-        self.display_handler.handle_thinking_display(msg)
-        self.display_handler.handle_text_display(msg)
-
-        # Perform final cleanup
-        self.display_handler.handle_final_cleanup(msg, last)
+        # Use the display handler to manage all display logic in a single pass over the
+        # content; it also performs the final cleanup, even if rendering fails
+        self.display_handler.handle(msg, last)
 
-        # For intermediate messages, flush more often to enable streaming
-        if not last:
-            import sys
-            sys.stdout.flush()
\ No newline at end of file
+        # Flush the final message right away; while streaming, coalesce the per-token
+        # flushes so at most one flush syscall is issued every _FLUSH_INTERVAL seconds
+        now = time.monotonic()
+        if last or now - self._last_flush >= _FLUSH_INTERVAL:
+            sys.stdout.flush()
+            self._last_flush = now
\ No newline at end of file
@@ -1,12 +1,27 @@
+import os
 import json
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
 from passion.utils.common import find_project_root
 
+# Use orjson's C parser when it is installed, the standard library otherwise; orjson's
+# decode error subclasses json.JSONDecodeError, so error handling is the same for both
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
 def load_config():
+    """
+    Loads the model configuration. The file is located and parsed once per process;
+    later calls return the same dict.
+    """
     project_root = find_project_root()
     
     # Define search paths in order of priority
@@ -16,11 +31,15 @@ def load_config():
         Path.home() / ".passion" / "config.json"
     ]
     
+    # One stat per candidate, stopping at the first one that exists
     config_path = None
     for path in search_paths:
-        if path.exists():
-            config_path = path
-            break
+        try:
+            os.stat(path)
+        except OSError:
+            continue
+        config_path = path
+        break
             
     if not config_path:
         logger.error("Configuration file not found. Searched in:")
@@ -32,8 +51,8 @@ def load_config():
 
     # Read the model configuration manually
     try:
-        with open(config_path, 'r') as f:
-            model_configs = json.load(f)
+        with open(config_path, 'rb') as f:
+            model_configs = _loads(f.read())
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON in {config_path}")
         sys.exit(1)
@@ -1,11 +1,23 @@
 """
 Display module for Passion Agent.
+Classes are imported lazily on first access, so importing the package doesn't load rich.
 """
-from .components import StreamDisplayManager, SimpleLineLimiter, DisplayStyles, MessageDisplayHandler
+from importlib import import_module
 
 __all__ = [
     "StreamDisplayManager",
     "SimpleLineLimiter",
     "DisplayStyles",
     "MessageDisplayHandler"
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in __all__:
+        value = getattr(import_module(".components", __name__), name)
+        # Cache on the module so later lookups don't come back here
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
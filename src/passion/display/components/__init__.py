@@ -1,14 +1,31 @@
 """
 Components module for Passion Agent display functionality.
+Classes are imported lazily on first access, so each one only loads the rich modules it needs.
 """
-from .stream_display_manager import StreamDisplayManager
-from .simple_line_limiter import SimpleLineLimiter
-from .display_styles import DisplayStyles
-from .message_display_handler import MessageDisplayHandler
+from importlib import import_module
 
 __all__ = [
     "StreamDisplayManager",
     "SimpleLineLimiter", 
     "DisplayStyles",
     "MessageDisplayHandler"
-]
\ No newline at end of file
+]
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    "StreamDisplayManager": "stream_display_manager",
+    "SimpleLineLimiter": "simple_line_limiter",
+    "DisplayStyles": "display_styles",
+    "MessageDisplayHandler": "message_display_handler",
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(f".{_LAZY_IMPORTS[name]}", __name__), name)
+        # Cache on the module so later lookups don't come back here
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
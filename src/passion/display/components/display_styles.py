@@ -1,7 +1,7 @@
 """
 Display Styles - centralized styling for the display elements.
 """
-from typing import Dict, Any
+from functools import lru_cache
 
 
 class DisplayStyles:
@@ -15,6 +15,26 @@ class DisplayStyles:
     AGENT_NAME_STYLE = "<b><ansicyan>{}: </ansicyan></b>"
     
     @staticmethod
+    @lru_cache(maxsize=8)
     def separator_line(width: int = 80, char: str = '─') -> str:
         """Generate a separator line of specified width and character."""
-        return f"<ansigray>{char * width}</ansigray>"
\ No newline at end of file
+        return f"<ansigray>{char * width}</ansigray>"
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def separator_ansi(width: int = 80, char: str = '─') -> str:
+        """Generate a dim separator line as a ready-to-write ANSI string (with trailing newline)."""
+        return f"\x1b[2m{char * width}\x1b[0m\n"
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def separator_plain(width: int = 80, char: str = '─') -> str:
+        """Generate an unstyled separator line as a ready-to-write string (with trailing newline)."""
+        return f"{char * width}\n"
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def omitted_marker(lines_omitted: int, dim: bool = False) -> str:
+        """Generate the marker that replaces omitted lines, optionally wrapped in dim markup."""
+        marker = f"[...{lines_omitted} lines omitted...]"
+        return f"[dim]{marker}[/dim]" if dim else marker
\ No newline at end of file
@@ -7,8 +7,14 @@ Features:
 - "Tail-f" Streaming & Auto-scrolling.
 - Robust Input merging.
 """
-import sys
-from typing import Dict, Any, Optional, Set
+import io
+import re
+import signal
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from agentscope.message import Msg
 from rich.console import Console, Group
 from rich.live import Live
@@ -17,55 +23,367 @@ from rich.text import Text
 from rich.panel import Panel
 from rich.syntax import Syntax
 from rich.rule import Rule
-from rich.table import Table
-from rich import box 
+
+from .display_styles import DisplayStyles
+
+# 按工具名/语言做成员判断的常量，模块级 frozenset，避免每个事件都新建列表再线性查找
+_PLAN_TOOLS = frozenset(("create_plan", "mark_task_completed", "add_task", "get_plan"))
+_SYNTAX_LEXERS = frozenset(("python", "bash"))
+
+# 以流式面板显示参数的工具：工具名 -> (内容参数名, 标题, lexer, 元信息参数名)
+_TOOL_CONFIG: Dict[str, Tuple[str, str, str, str]] = {
+    "execute_python_code": ("code", "Python Code", "python", "code"),
+    "execute_shell_command": ("command", "Shell Command", "bash", "command"),
+    "write_text_file": ("content", "Writing File", "markdown", "file_path"),
+}
+
+# Plan 输出中的任务行："1. ✅ 描述" -> (图标, 描述)；一次匹配代替逐行多次 split/查找
+_PLAN_LINE_RE = re.compile(r"\d+\.\s+(\S+)\s*(.*)")
+# 含这些子串的 Plan 输出行不是任务（标题、完成提示），直接跳过
+_PLAN_SKIP_SUBSTRINGS = ("Current Plan:", "marked as completed")
+
+# 终端宽度缓存的有效期（秒）：rich 的 console.width 每次都会调用 os.get_terminal_size；
+# 只在无法监听 SIGWINCH 时使用（Windows、非主线程、信号已被别人接管）
+_WIDTH_TTL = 0.5
+
+# 终端尺寸变化信号（Windows 上没有）
+_SIGWINCH = getattr(signal, "SIGWINCH", None)
+
+# 同一个工具面板两次重新渲染（Syntax 高亮 + 布局）之间的最短间隔（秒）
+_PANEL_RENDER_INTERVAL = 0.1
+
+# 工具面板可见内容的最大字符数
+_MAX_PANEL_CHARS = 65536
+
+# 除 "\n" 以外 splitlines() 也会拆分的行分隔符；内容里出现它们时 _tail_lines 退回 splitlines()
+_OTHER_LINE_BREAKS_RE = re.compile("[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# 可见内容超过这个字符数时不再做语法高亮（markdown 本来就不高亮）
+_MAX_HIGHLIGHT_CHARS = 4096
+
+# 流式文本缓冲最多攒多久（秒）才写出一次；遇到换行立即写出
+_TEXT_FLUSH_INTERVAL = 0.05
+
+# 短于这个长度的纯空白增量不单独触发写出
+_MAX_HELD_WHITESPACE = 16
+
+# 未正常结束（中断/异常）的消息最多保留多少条流式状态，超出后按 LRU 淘汰
+_MAX_TRACKED_MSGS = 64
+
+# 最多保留多少个工具调用的参数（结果显示时要用），超出后按 LRU 淘汰最早的调用
+_MAX_TRACKED_TOOLS = 256
+
+# 已打印/已停止的工具调用 id、已结束的消息 id 各最多记住多少个；长时间会话中只需要防止最近的重复渲染
+_MAX_SEEN_TOOL_IDS = 1024
+_MAX_SEEN_MSG_IDS = 4096
+
+@dataclass(slots=True)
+class _MsgState:
+    """一条正在流式输出的消息的显示状态，每个 msg_id 只对应这一个对象"""
+    # text block 下标 -> 已打印长度；每个 text block 单独记录，只输出各自的新增部分
+    text_lens: Dict[int, int] = field(default_factory=dict)
+
+class _RecentIds(OrderedDict):
+    """只记住最近 maxlen 个 id 的集合：O(1) 成员判断，超出后淘汰最早加入的 id"""
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def add(self, key: Any) -> None:
+        self[key] = None
+        self.move_to_end(key)
+        if len(self) > self.maxlen:
+            self.popitem(last=False)
+
+# 收到 SIGWINCH 的次数；各 handler 记下自己取宽度时的值，不同即说明终端尺寸变过
+_resize_count = 0
+
+def _on_sigwinch(signum, frame) -> None:
+    global _resize_count
+    _resize_count += 1
+
+def _watch_resize() -> bool:
+    """
+    确保 SIGWINCH 由 _on_sigwinch 处理，返回能否依赖它判断终端尺寸变化。
+    prompt_toolkit 每次 prompt 结束都会把 SIGWINCH 恢复成默认处理，所以每次都要检查，必要时重新安装；
+    只替换默认处理，不抢别人的处理函数。
+    """
+    global _resize_count
+    if _SIGWINCH is None: return False
+    current = signal.getsignal(_SIGWINCH)
+    if current is _on_sigwinch: return True
+    if current is not signal.SIG_DFL: return False
+    try:
+        signal.signal(_SIGWINCH, _on_sigwinch)
+    except ValueError:  # 不在主线程
+        return False
+    # 没有监听的这段时间里尺寸可能变过
+    _resize_count += 1
+    return True
+
+def _output_to_text(output: Any) -> str:
+    """
+    把工具输出转成纯文本：str 直接返回；block 列表（agentscope 的标准形态）一次 join 拼接其中的 text block，
+    与 _normalize_blocks 一样，列表中的裸字符串也当作文本。
+    """
+    if isinstance(output, str):
+        return output
+    if isinstance(output, list):
+        return "".join(
+            block if isinstance(block, str)
+            else block.get("text", "") if isinstance(block, dict) and block.get("type") == "text"
+            else ""
+            for block in output
+        )
+    return "" if output is None else str(output)
+
+@lru_cache(maxsize=64)
+def _make_syntax(display_content: str, lexer: str, start_line: int) -> Syntax:
+    """
+    构建代码面板里的 Syntax；内容不变的重复增量（如只多了空白）直接复用之前的对象。
+    只显示最后几行，所以缓存天然有界。
+    """
+    return Syntax(
+        display_content, 
+        lexer, 
+        theme="monokai", 
+        line_numbers=True, 
+        start_line=start_line, 
+        word_wrap=True
+    )
+
+@lru_cache(maxsize=128)
+def _make_panel(display_content: str, title: str, lexer: str, hidden_count: int, start_line: int) -> Panel:
+    """
+    构建工具面板；可见内容没变的重复更新直接复用之前的 Panel。
+    返回的对象是共享的，调用方（Live 只在渲染时读取）不能修改它。
+    """
+    render_objects = []
+    
+    if hidden_count:
+        info_text = Text(f"... ({hidden_count} lines hidden)", style="dim italic")
+        render_objects.append(info_text)
+        
+    if lexer in _SYNTAX_LEXERS:
+        if len(display_content) <= _MAX_HIGHLIGHT_CHARS:
+            render_objects.append(_make_syntax(display_content, lexer, start_line))
+        else:
+            # 内容太长时不做 Pygments 高亮，只手工加上行号
+            numbered = "\n".join(f"{n:4d}  {line}" for n, line in enumerate(display_content.split("\n"), start_line))
+            render_objects.append(Text(numbered))
+    else:
+        render_objects.append(Text(display_content))
+
+    return Panel(
+        Group(*render_objects), 
+        title=f"[bold]{title}[/]", 
+        border_style="blue", 
+        padding=(0, 1)
+    )
+
+def _tail_lines(content: str, max_lines: int) -> Tuple[str, int, int]:
+    """
+    从末尾反向找换行，只切出最后 max_lines 行，返回 (显示内容, 隐藏行数, 起始行号)。
+    行的划分与 splitlines() 一致（末尾换行不算新的一行），但不会为整段内容建列表。
+    含 "\r" 等其他行分隔符的内容（如进度条输出）直接用 splitlines()，保证行数一致。
+    """
+    if _OTHER_LINE_BREAKS_RE.search(content):
+        lines = content.splitlines()
+        if len(lines) <= max_lines:
+            return content, 0, 1
+        hidden_count = len(lines) - max_lines
+        return "\n".join(lines[-max_lines:]), hidden_count, hidden_count + 1
+
+    end = len(content) - 1 if content.endswith("\n") else len(content)
+    pos = end
+    for _ in range(max_lines):
+        pos = content.rfind("\n", 0, pos)
+        if pos == -1:
+            return content, 0, 1
+
+    hidden_count = content.count("\n", 0, pos) + 1
+    return content[pos + 1:end], hidden_count, hidden_count + 1
+
+def _normalize_blocks(content: Any) -> list:
+    """
+    把消息内容统一成 block dict 列表：字符串内容包成一个 text block，列表中偶尔出现的裸字符串 block 也转成 text block，
+    这样下游分发时只需处理 dict。
+    """
+    if not isinstance(content, list):
+        return [{"type": "text", "text": str(content)}]
+    # 常见情况：全部已经是 dict，直接复用原列表
+    if not any(isinstance(block, str) for block in content):
+        return content
+    return [{"type": "text", "text": block} if isinstance(block, str) else block for block in content]
 
 class MessageDisplayHandler:
+    # block 类型 -> 处理函数，handle() 中每个 block 只做一次字典查找
+    _BLOCK_HANDLERS = {
+        "text": lambda self, msg_id, index, block: self._handle_text_block(msg_id, index, block),
+        "tool_use": lambda self, msg_id, index, block: block.get("id") and self._handle_tool_use_block(msg_id, block),
+        "tool_result": lambda self, msg_id, index, block: self._handle_tool_result_block(msg_id, block),
+        "thinking": lambda self, msg_id, index, block: self._handle_thinking_block(block, msg_id),
+    }
+    # 与 handle_thinking_display 一致，只看第一个 thinking block，之后换用这张表
+    _BLOCK_HANDLERS_AFTER_THINKING = {k: v for k, v in _BLOCK_HANDLERS.items() if k != "thinking"}
+
     def __init__(self, display_manager: Any = None, name: str = "Passion"):
         self.display_manager = display_manager 
         self.name = name
         self.console = Console()
         
-        self.PLAN_TOOLS = ["create_plan", "mark_task_completed", "add_task", "get_plan"]
+        self.PLAN_TOOLS = _PLAN_TOOLS
         
         # Live 实例池
         self.status_live: Optional[Live] = None
+        # status_live 显示的 Spinner，更新时原地修改它的文字
+        self._spinner: Optional[Spinner] = None
+        # Spinner 当前显示的文字；相同文字的重复更新直接跳过
+        self._last_spinner_text: Optional[str] = None
         self.active_tool_lives: Dict[str, Live] = {}
+        # 节流期间积压的最新面板内容 (content, title, lexer)，以及各面板上次渲染的时间
+        self._pending_panels: Dict[str, Tuple[str, str, str]] = {}
+        self._panel_rendered_at: Dict[str, float] = {}
         
         # 状态追踪
-        self._printed_keys: Set[str] = set()
+        # 已打印过“工具开始”/“工具结果”的调用，各用一个集合，直接以 block_id（缺失时为 msg_id）为键
+        self._printed_tool_starts = _RecentIds(_MAX_SEEN_TOOL_IDS)
+        self._printed_tool_ends = _RecentIds(_MAX_SEEN_TOOL_IDS)
         self._has_responded = False
-        self._finished_msg_ids: Set[str] = set()
-        self._stream_lengths: Dict[str, int] = {}
-        self._tool_inputs: Dict[str, dict] = {}
+        self._finished_msg_ids = _RecentIds(_MAX_SEEN_MSG_IDS)
+        self._msg_states: "OrderedDict[str, _MsgState]" = OrderedDict()
+        self._tool_inputs: "OrderedDict[str, dict]" = OrderedDict()
         
         # 记录所有已经停止/结束的 block_id，防止跨回合重复渲染
-        self._stopped_block_ids: Set[str] = set()
+        self._stopped_block_ids = _RecentIds(_MAX_SEEN_TOOL_IDS)
+
+        # Styled renderables built once and reused: the reply prefix, tool headers per tool
+        # name, and the end-of-message separator (Rule measures the console width at render time)
+        self._name_prefix = Text.from_markup(f"\n[bold blue]{name}:[/] ")
+        self._header_cache: Dict[str, Text] = {}
+        self._separator = Rule(style="dim")
+
+        # 最近一次规范化的结果 (原始 content 对象, block 列表)；各个 handle_*_display 对同一次内容只规范化一次
+        self._normalized: Optional[Tuple[Any, list]] = None
+
+        # 上次显示在 Spinner 上的思考内容 (msg_id, 最后一行)
+        self._thinking_tail: Optional[Tuple[Optional[str], str]] = None
+
+        # 缓存的终端宽度，及其获取时间 / 当时的 _resize_count
+        self._console_width = 80
+        self._width_checked_at = float("-inf")
+        self._width_resize_count = -1
+
+        # 流式文本的写缓冲：逐 token 的增量先攒在这里，按时间或换行批量写出，
+        # 其他任何输出之前都会先 _flush_text，保证顺序
+        self._out_buf = io.StringIO()
+        self._last_text_flush = 0.0
+
+    def _emit(self, text: str) -> None:
+        """把一段流式文本写入缓冲，距上次写出超过 _TEXT_FLUSH_INTERVAL 或遇到换行时才真正写出"""
+        self._out_buf.write(text)
+        # 单独到达的短空白增量（换行、缩进）先攒着，等下一个有可见字符的增量一起写出
+        if len(text) < _MAX_HELD_WHITESPACE and text.isspace(): return
+        if "\n" in text or time.monotonic() - self._last_text_flush >= _TEXT_FLUSH_INTERVAL:
+            self._flush_text()
+
+    def _flush_text(self) -> None:
+        """写出缓冲中尚未输出的流式文本"""
+        pending = self._out_buf.getvalue()
+        if not pending: return
+        self._out_buf.seek(0)
+        self._out_buf.truncate()
+        self.console.file.write(pending)
+        self.console.file.flush()
+        self._last_text_flush = time.monotonic()
 
     def _update_status_spinner(self, text: str):
         """更新或启动底部的状态 Spinner"""
         if self._has_responded: return
+        if text == self._last_spinner_text: return
+        self._flush_text()
         
         # 使用 dim 样式让思考过程看起来不那么刺眼
-        spinner = Spinner("dots", text=Text(f" {text}", style="cyan"))
+        status_text = Text(f" {text}", style="cyan")
         
         if self.status_live is None:
-            self.status_live = Live(spinner, console=self.console, refresh_per_second=12, transient=True)
+            self._spinner = Spinner("dots", text=status_text)
+            self.status_live = Live(self._spinner, console=self.console, refresh_per_second=12, transient=True)
             self.status_live.start()
         else:
-            self.status_live.update(spinner)
+            # Live 按自己的刷新频率重绘同一个 Spinner，只需替换文字（动画也不会因此重新开始）
+            self._spinner.update(text=status_text)
+        self._last_spinner_text = text
 
     def _stop_status_spinner(self):
-        if self.status_live is not None:
-            try: self.status_live.stop()
-            except: pass
-            finally: self.status_live = None
-
-    def _get_tracker_key(self, msg_id: str, block_id: Optional[str], suffix: str = "") -> str:
-        if block_id:
-            return f"tool:{block_id}:{suffix}"
-        else:
-            return f"msg:{msg_id}:{suffix}"
+        live = self.status_live
+        if live is None: return
+        # 先清空状态再停止；Live.stop() 自身对未启动/已停止的情况有保护，无需再包 try
+        self.status_live = None
+        self._spinner = None
+        self._last_spinner_text = None
+        live.stop()
+
+    def _normalize_content(self, msg: Msg) -> list:
+        """按 content 对象的身份缓存 _normalize_blocks 的结果"""
+        content = msg.content
+        cached = self._normalized
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        blocks = _normalize_blocks(content)
+        # 只缓存不会失效的结果：字符串不可变；原列表直接复用时，原地修改也会同步反映
+        if blocks is content or not isinstance(content, list):
+            self._normalized = (content, blocks)
+        return blocks
+
+    def _get_console_width(self) -> int:
+        """返回终端宽度：能监听 SIGWINCH 时只在尺寸变化后重新查询，否则最多每 _WIDTH_TTL 秒查询一次"""
+        if _watch_resize():
+            if self._width_resize_count != _resize_count:
+                self._width_resize_count = _resize_count
+                self._console_width = self.console.width
+            return self._console_width
+
+        now = time.monotonic()
+        if now - self._width_checked_at >= _WIDTH_TTL:
+            self._console_width = self.console.width
+            self._width_checked_at = now
+        return self._console_width
+
+    def handle(self, msg: Msg, last: bool = True) -> None:
+        """
+        单次遍历消息内容，按 block 类型分发到对应的处理函数，最后做收尾清理。
+        """
+        msg_id = msg.id
+        # 已结束的消息只需这一次成员判断，规范化、分发和收尾都跳过
+        if msg_id in self._finished_msg_ids: return
+
+        try:
+            content = self._normalize_content(msg)
+            handlers = self._BLOCK_HANDLERS
+
+            for index, block in enumerate(content):
+                block_type = block.get("type")
+                handler = handlers.get(block_type)
+                if handler is None: continue
+                handler(self, msg_id, index, block)
+                if block_type == "thinking":
+                    handlers = self._BLOCK_HANDLERS_AFTER_THINKING
+        finally:
+            self.handle_final_cleanup(msg, last)
+
+    def emit_tool_use(self, tool_call: dict) -> None:
+        """
+        直接显示一次工具调用（ToolUseBlock），无需先包装成 Msg。
+        """
+        if tool_call.get("id"):
+            self._handle_tool_use_block(None, tool_call)
+
+    def emit_tool_result(self, tool_call_id: str, tool_name: str, result: Any) -> None:
+        """
+        直接显示一次工具结果，无需先包装成 Msg。
+        """
+        self._handle_tool_result_block(None, {"id": tool_call_id, "name": tool_name, "output": result})
 
     def handle_thinking_display(self, msg: Msg) -> bool:
         """
@@ -73,89 +391,99 @@ class MessageDisplayHandler:
         [新增功能] 实时提取思考内容的最后一行显示在 Spinner 上。
         """
         if msg.id in self._finished_msg_ids: return False
-        content = msg.content if isinstance(msg.content, list) else [{"type": "text", "text": str(msg.content)}]
+        content = self._normalize_content(msg)
         
         for block in content:
             if block.get("type") == "thinking":
-                if not self._has_responded:
-                    # 获取思考的完整文本
-                    thought_content = block.get("thinking", "")
-                    
-                    display_text = "Passion is thinking..."
-                    
-                    # 提取最后一行非空文本，让用户看到它正在想什么
-                    if thought_content:
-                        # 按行分割，过滤空行
-                        lines = [line.strip() for line in thought_content.split('\n') if line.strip()]
-                        if lines:
-                            last_line = lines[-1]
-                            # 如果太长，截取后60个字符，保留句尾信息
-                            if len(last_line) > 60:
-                                last_line = "..." + last_line[-57:]
-                            
-                            # 移除 markdown 标记防止格式混乱
-                            last_line = last_line.replace("```", "").replace("#", "")
-                            display_text = f"Thinking: {last_line}"
-
-                    self._update_status_spinner(display_text)
+                self._handle_thinking_block(block, msg.id)
                 return True
         return False
 
+    def _handle_thinking_block(self, block: dict, msg_id: Optional[str] = None) -> None:
+        if not self._has_responded:
+            # 获取思考的完整文本
+            thought_content = block.get("thinking", "")
+            
+            display_text = "Passion is thinking..."
+            
+            # 提取最后一行非空文本，让用户看到它正在想什么：
+            # 去掉末尾空白后从后往前找换行，只看最后一行，不分割整段思考内容
+            stripped = thought_content.rstrip() if thought_content else ""
+            last_line = stripped[stripped.rfind('\n') + 1:].strip()
+
+            # 同一条消息的最后一行没变（例如只多了空白/换行），Spinner 已经显示着它，无需更新
+            if (msg_id, last_line) == self._thinking_tail and self.status_live is not None:
+                return
+            self._thinking_tail = (msg_id, last_line)
+
+            if last_line:
+                # 如果太长，截取后60个字符，保留句尾信息
+                if len(last_line) > 60:
+                    last_line = "..." + last_line[-57:]
+                
+                # 移除 markdown 标记防止格式混乱
+                last_line = last_line.replace("```", "").replace("#", "")
+                display_text = f"Thinking: {last_line}"
+
+            self._update_status_spinner(display_text)
+
     def handle_tool_use_display(self, msg: Msg, last: bool = True) -> bool:
         if msg.id in self._finished_msg_ids: return False
 
-        content = msg.content if isinstance(msg.content, list) else [{"type": "text", "text": str(msg.content)}]
+        content = self._normalize_content(msg)
         msg_id = msg.id
         processed_any = False
 
         for block in content:
-            block_type = block.get("type")
-            block_id = block.get("id")
-            
-            if block_type == "tool_use":
-                if not block_id: continue
-                
-                tool_name = block.get("name")
-                tool_input = block.get("input", {})
-                
-                # 1. 参数持久化
-                if block_id not in self._tool_inputs:
-                    self._tool_inputs[block_id] = {}
-                if isinstance(tool_input, dict) and tool_input:
-                    self._tool_inputs[block_id].update(tool_input)
-                
-                start_key = self._get_tracker_key(msg_id, block_id, "tool_start")
-                
-                # 2. 显示“工具开始”
-                if start_key not in self._printed_keys:
-                    self.console.print(f"[dim]🛠️  Using tool: {tool_name}...[/dim]")
-                    self._printed_keys.add(start_key)
-
-                is_streaming_tool = tool_name in ["execute_python_code", "execute_shell_command", "write_text_file"]
-                
-                if is_streaming_tool:
-                    self._stop_status_spinner()
-                    full_input = self._tool_inputs[block_id]
-                    self._handle_streaming_panel(block_id, tool_name, full_input)
-                else:
-                    action_text = f"Updating plan..." if tool_name in self.PLAN_TOOLS else f"Running {tool_name}..."
-                    self._update_status_spinner(action_text)
-
+            if block.get("type") == "tool_use" and block.get("id"):
+                self._handle_tool_use_block(msg_id, block)
                 processed_any = True
         return processed_any
 
+    def _handle_tool_use_block(self, msg_id: str, block: dict) -> None:
+        self._flush_text()
+        block_id = block.get("id")
+        tool_name = block.get("name")
+        tool_input = block.get("input", {})
+
+        # 1. 参数持久化
+        inputs = self._tool_inputs.get(block_id)
+        if inputs is None:
+            inputs = self._tool_inputs[block_id] = {}
+            if len(self._tool_inputs) > _MAX_TRACKED_TOOLS:
+                self._tool_inputs.popitem(last=False)
+        else:
+            self._tool_inputs.move_to_end(block_id)
+        # 输入本来就是 dict，直接合并；只有异常的非 dict 输入才会走到 except
+        try: inputs.update(tool_input)
+        except (TypeError, ValueError): pass
+
+        start_key = block_id or msg_id
+
+        # 2. 显示“工具开始”
+        if start_key not in self._printed_tool_starts:
+            header = self._header_cache.get(tool_name)
+            if header is None:
+                header = self._header_cache[tool_name] = Text(f"🛠️  Using tool: {tool_name}...", style="dim")
+            self.console.print(header)
+            self._printed_tool_starts.add(start_key)
+
+        is_streaming_tool = tool_name in _TOOL_CONFIG
+
+        if is_streaming_tool:
+            self._stop_status_spinner()
+            self._handle_streaming_panel(block_id, tool_name, inputs)
+        else:
+            action_text = f"Updating plan..." if tool_name in self.PLAN_TOOLS else f"Running {tool_name}..."
+            self._update_status_spinner(action_text)
+
     def _handle_streaming_panel(self, block_id, tool_name, tool_input):
         if block_id in self._stopped_block_ids:
             return
 
-        tool_config = {
-            "execute_python_code": ("code", "Python Code", "python", "code"),
-            "execute_shell_command": ("command", "Shell Command", "bash", "command"),
-            "write_text_file": ("content", "Writing File", "markdown", "file_path")
-        }
-        
-        if tool_name not in tool_config: return
-        key, title_prefix, lexer, meta_key = tool_config[tool_name]
+        cfg = _TOOL_CONFIG.get(tool_name)
+        if cfg is None: return
+        key, title_prefix, lexer, meta_key = cfg
         
         if meta_key not in tool_input and key not in tool_input: return
         content_str = tool_input.get(key, "")
@@ -174,189 +502,182 @@ class MessageDisplayHandler:
             live = Live(renderable, console=self.console, refresh_per_second=10)
             live.start()
             self.active_tool_lives[block_id] = live
+            self._panel_rendered_at[block_id] = time.monotonic()
         else:
-            live = self.active_tool_lives[block_id]
-            renderable = self._create_panel_renderable(content_str, title, lexer)
-            live.update(renderable)
+            now = time.monotonic()
+            if now - self._panel_rendered_at[block_id] < _PANEL_RENDER_INTERVAL:
+                # 合并高频更新：只记下最新内容，到时间或面板结束时再渲染
+                self._pending_panels[block_id] = (content_str, title, lexer)
+                return
+            self._pending_panels.pop(block_id, None)
+            self.active_tool_lives[block_id].update(self._create_panel_renderable(content_str, title, lexer))
+            self._panel_rendered_at[block_id] = now
+
+    def _stop_tool_live(self, block_id: str) -> None:
+        """先把节流中积压的最新内容渲染出来，再停止该工具面板的 Live"""
+        live = self.active_tool_lives.pop(block_id)
+        self._panel_rendered_at.pop(block_id, None)
+        pending = self._pending_panels.pop(block_id, None)
+        try:
+            if pending is not None:
+                live.update(self._create_panel_renderable(*pending))
+            live.stop()
+        except: pass
 
     def _create_panel_renderable(self, content: str, title: str, lexer: str):
         if not content: content = " "
         
-        if lexer in ["python", "bash"]:
+        if lexer in _SYNTAX_LEXERS:
             MAX_LINES = 8
         else:
             MAX_LINES = 3 
 
-        lines = content.splitlines()
-        total_lines = len(lines)
-        
-        render_objects = []
-        
-        if total_lines > MAX_LINES:
-            hidden_count = total_lines - MAX_LINES
-            visible_lines = lines[-MAX_LINES:]
-            
-            info_text = Text(f"... ({hidden_count} lines hidden)", style="dim italic")
-            render_objects.append(info_text)
-            
-            display_content = "\n".join(visible_lines)
-            start_line_number = hidden_count + 1 
-        else:
-            display_content = content
-            start_line_number = 1
-            
-        if lexer == "python" or lexer == "bash":
-            code_block = Syntax(
-                display_content, 
-                lexer, 
-                theme="monokai", 
-                line_numbers=True, 
-                start_line=start_line_number, 
-                word_wrap=True
-            )
-            render_objects.append(code_block)
-        else:
-            render_objects.append(Text(display_content))
-
-        return Panel(
-            Group(*render_objects), 
-            title=f"[bold]{title}[/]", 
-            border_style="blue", 
-            padding=(0, 1)
-        )
+        display_content, hidden_count, start_line_number = _tail_lines(content, MAX_LINES)
+        # 极长的行（如没有换行的大文件内容）只保留结尾部分，限制高亮和缓存键的开销
+        if len(display_content) > _MAX_PANEL_CHARS:
+            display_content = display_content[-_MAX_PANEL_CHARS:]
+        return _make_panel(display_content, title, lexer, hidden_count, start_line_number)
 
     def handle_tool_result_display(self, msg: Msg) -> bool:
         if msg.id in self._finished_msg_ids: return False
         
-        content = msg.content if isinstance(msg.content, list) else [{"type": "text", "text": str(msg.content)}]
+        content = self._normalize_content(msg)
         msg_id = msg.id
         processed_any = False
 
         for block in content:
             if block.get("type") == "tool_result":
-                block_id = block.get("id")
-                end_key = self._get_tracker_key(msg_id, block_id, "tool_end")
-
-                if end_key not in self._printed_keys:
-                    if block_id in self.active_tool_lives:
-                        self.active_tool_lives[block_id].stop()
-                        del self.active_tool_lives[block_id]
-                    self._stopped_block_ids.add(block_id)
-                    
-                    self._stop_status_spinner()
-
-                    tool_name = block.get("name", "Tool")
-                    raw_output = block.get("output")
-
-                    if raw_output is None or str(raw_output).strip() == "" or str(raw_output) == "None":
-                        self._printed_keys.add(end_key)
-                        continue 
-
-                    # Plan 清单
-                    if tool_name in self.PLAN_TOOLS:
-                        lines = str(raw_output).strip().split('\n')
-                        self.console.print() 
-                        self.console.print("  [bold]📋 Current Plan[/]") 
-                        
-                        for line in lines:
-                            line = line.strip()
-                            if not line or "Current Plan:" in line or "marked as completed" in line or line.startswith("Result:"): 
-                                continue
-                            if line[0].isdigit() and ". " in line:
-                                try:
-                                    parts = line.split(". ", 1)
-                                    rest = parts[1]
-                                    if " " in rest:
-                                        icon, desc = rest.split(" ", 1)
-                                    else:
-                                        icon, desc = rest, ""
-                                    
-                                    if "✅" in icon:
-                                        self.console.print(f"    [green]{icon}[/] {desc}")
-                                    else:
-                                        self.console.print(f"    [dim]{icon} {desc}[/dim]")
-                                except:
-                                    self.console.print(f"    {line}")
-                        self.console.print() 
-                    
-                    else:
-                        tool_input = self._tool_inputs.get(block_id, {})
-                        
-                        file_path = tool_input.get("file_path") or tool_input.get("filename") or tool_input.get("path") or "unknown file"
-                        
-                        summary = ""
-                        if tool_name == "view_text_file":
-                            summary = f"read: {file_path}"
-                        elif tool_name == "write_text_file":
-                            summary = f"wrote to: {file_path}"
-                        else:
-                            output_str = str(raw_output).strip()
-                            output_single_line = output_str.replace("\n", " ").replace("\r", "")
-                            if len(output_single_line) > 50:
-                                summary = output_single_line[:50] + "..."
-                            else:
-                                summary = output_single_line
-
-                        self.console.print(f"[bold green]✓[/] {tool_name} executed. [dim]({summary})[/]")
-                    
-                    self._printed_keys.add(end_key)
-                    
-                    if not self._has_responded:
-                        self._update_status_spinner("Passion is analyzing results...")
-                
+                self._handle_tool_result_block(msg_id, block)
                 processed_any = True
         return processed_any
 
+    def _handle_tool_result_block(self, msg_id: str, block: dict) -> None:
+        self._flush_text()
+        block_id = block.get("id")
+        end_key = block_id or msg_id
+
+        if end_key not in self._printed_tool_ends:
+            if block_id in self.active_tool_lives:
+                self._stop_tool_live(block_id)
+            self._stopped_block_ids.add(block_id)
+
+            self._stop_status_spinner()
+
+            tool_name = block.get("name", "Tool")
+            # 只转换一次，后续判断与摘要都复用这个字符串
+            output_str = _output_to_text(block.get("output")).strip()
+
+            if output_str == "" or output_str == "None":
+                self._printed_tool_ends.add(end_key)
+                return
+
+            # Plan 清单
+            if tool_name in self.PLAN_TOOLS:
+                lines = output_str.split('\n')
+                self.console.print() 
+                self.console.print("  [bold]📋 Current Plan[/]") 
+
+                for line in lines:
+                    line = line.strip()
+                    if not line or line.startswith("Result:") or any(s in line for s in _PLAN_SKIP_SUBSTRINGS):
+                        continue
+                    m = _PLAN_LINE_RE.match(line)
+                    if m is None: continue
+                    icon, desc = m.groups()
+                    if "✅" in icon:
+                        self.console.print(f"    [green]{icon}[/] {desc}")
+                    else:
+                        self.console.print(f"    [dim]{icon} {desc}[/dim]")
+                self.console.print() 
+
+            else:
+                tool_input = self._tool_inputs.get(block_id, {})
+
+                file_path = tool_input.get("file_path") or tool_input.get("filename") or tool_input.get("path") or "unknown file"
+
+                summary = ""
+                if tool_name == "view_text_file":
+                    summary = f"read: {file_path}"
+                elif tool_name == "write_text_file":
+                    summary = f"wrote to: {file_path}"
+                else:
+                    output_single_line = output_str.replace("\n", " ").replace("\r", "")
+                    if len(output_single_line) > 50:
+                        summary = output_single_line[:50] + "..."
+                    else:
+                        summary = output_single_line
+
+                self.console.print(f"[bold green]✓[/] {tool_name} executed. [dim]({summary})[/]")
+
+            self._printed_tool_ends.add(end_key)
+
+            if not self._has_responded:
+                self._update_status_spinner("Passion is analyzing results...")
+
     def handle_text_display(self, msg: Msg) -> bool:
         if msg.id in self._finished_msg_ids: return False
 
-        content = msg.content if isinstance(msg.content, list) else [{"type": "text", "text": str(msg.content)}]
+        content = self._normalize_content(msg)
         msg_id = msg.id
         processed_any = False
 
-        for block in content:
+        for index, block in enumerate(content):
             if block.get("type") == "text":
-                text = block.get("text", "")
-                
-                stream_key = self._get_tracker_key(msg_id, None, "text_len")
-                prev_len = self._stream_lengths.get(stream_key, 0)
-
-                if len(text) > prev_len:
-                    self._stop_status_spinner()
-                    self._has_responded = True
-
-                    if prev_len == 0:
-                        self.console.print(f"\n[bold blue]{self.name}:[/] ", end="")
-                    
-                    new_chunk = text[prev_len:]
-                    self.console.print(new_chunk, end="", highlight=False)
-                    
-                    self._stream_lengths[stream_key] = len(text)
-                
+                self._handle_text_block(msg_id, index, block)
                 processed_any = True
         return processed_any
 
+    def _handle_text_block(self, msg_id: str, index: int, block: dict) -> None:
+        state = self._msg_states.get(msg_id)
+        if state is not None:
+            self._msg_states.move_to_end(msg_id)
+
+        text = block.get("text", "")
+        prev_len = state.text_lens.get(index, 0) if state is not None else 0
+
+        if len(text) > prev_len:
+            self._stop_status_spinner()
+            self._has_responded = True
+
+            if state is None:
+                state = self._msg_states[msg_id] = _MsgState()
+                if len(self._msg_states) > _MAX_TRACKED_MSGS:
+                    self._msg_states.popitem(last=False)
+                self._flush_text()
+                self.console.print(self._name_prefix, end="")
+            
+            new_chunk = text[prev_len:]
+            # 模型输出原样写出（不解析 rich markup），并攒批减少逐 token 的 write/flush
+            self._emit(new_chunk)
+            
+            state.text_lens[index] = len(text)
+
     def handle_final_cleanup(self, msg: Msg, last: bool = True) -> None:
         if not last: return
         if msg.id in self._finished_msg_ids: return
 
+        self._flush_text()
         self._stop_status_spinner()
         
         # 清理时，将所有活跃的 block_id 加入黑名单
-        for block_id, live in self.active_tool_lives.items():
-            try: live.stop()
-            except: pass
+        for block_id in list(self.active_tool_lives):
+            self._stop_tool_live(block_id)
             self._stopped_block_ids.add(block_id)
-            
-        self.active_tool_lives.clear()
         
         self._finished_msg_ids.add(msg.id)
         
-        stream_key = self._get_tracker_key(msg.id, None, "text_len")
-        has_text = stream_key in self._stream_lengths
+        has_text = self._msg_states.pop(msg.id, None) is not None
         
         if has_text:
             self.console.print() 
         
-        self.console.print(Rule(style="dim"))
+        if self.console.is_terminal and self.console.color_system and not self.console.legacy_windows:
+            # 终端下直接写预先生成的 ANSI 分隔线，跳过 rich 的渲染流程；旧版 Windows 控制台不认 ANSI，仍交给 Rule
+            self.console.file.write(DisplayStyles.separator_ansi(self._get_console_width()))
+        elif not self.console.color_system:
+            # 无颜色输出（管道、重定向）同样直接写预先生成的纯文本分隔线；与 Rule 一致，非 UTF 编码下用 '-'
+            char = '─' if self.console.encoding.startswith("utf") else '-'
+            self.console.file.write(DisplayStyles.separator_plain(self._get_console_width(), char))
+        else:
+            self.console.print(self._separator)
         self._has_responded = False
\ No newline at end of file
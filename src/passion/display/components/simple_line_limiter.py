@@ -2,7 +2,7 @@
 Simple Line Limiter - a utility to limit content to a maximum number of lines
 and add an indicator for omitted content.
 """
-from typing import Dict, Any
+from .display_styles import DisplayStyles
 
 
 class SimpleLineLimiter:
@@ -21,14 +21,15 @@ class SimpleLineLimiter:
         if not content:
             return content
             
-        all_lines = content.split('\n')
+        # Split off only the last max_lines lines; everything before them stays in one
+        # head string that is counted, not split into a list
+        parts = content.rsplit('\n', self.max_lines)
         
-        if len(all_lines) <= self.max_lines:
+        if len(parts) <= self.max_lines:
             return content
         
         # Calculate truncated lines
-        lines_truncated = len(all_lines) - self.max_lines
-        recent_lines = all_lines[-self.max_lines:]
-        display_lines = [f"[...{lines_truncated} lines omitted...]"] + recent_lines[1:]
+        lines_truncated = parts[0].count('\n') + 1
+        display_lines = [DisplayStyles.omitted_marker(lines_truncated)] + parts[2:]
         
         return '\n'.join(display_lines)
\ No newline at end of file
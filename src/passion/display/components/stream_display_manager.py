@@ -1,105 +1,159 @@
 """
 Stream Display Manager - manages dynamic streaming displays with line limits using rich Live.
-Each tool gets its own Live display that updates as content comes in.
+Each tool gets its own panel, and all panels are rendered by a single shared Live display.
 """
-import threading
-from rich.console import Console
+import time
+from collections import deque
+from itertools import chain, islice
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.live import Live
-from typing import Dict, Any
+
+from .display_styles import DisplayStyles
+
+# A panel whose content hasn't changed for this many seconds is redrawn immediately on its
+# next change instead of waiting for the Live's next refresh tick
+_IDLE_REFRESH_THRESHOLD = 0.1
 
 
 class StreamDisplayManager:
     """
     Manages dynamic streaming displays with line limits using rich Live.
-    Each tool gets its own Live display that updates as content comes in.
+    Each tool gets its own panel that updates as content comes in; the panels are stacked
+    in one Group rendered by a single Live, so concurrent tools share one refresh thread.
     Optimized to reduce redraws during scrolling.
     """
     def __init__(self, max_lines: int = 10):
-        self.displays = {}  # block_id -> Live display
+        self.displays = {}  # block_id -> panel shown in the shared Live
         self.buffers = {}   # block_id -> content buffer
         self.max_lines = max_lines
         self.console = Console()
+        self._group = Group()
+        self._live = None  # Started with the first display, stopped with the last
         
     def create_display(self, block_id: str, title: str = "Content"):
         """Create a new live display for a specific block"""
         if block_id not in self.displays:
             # Initialize content buffer
             self.buffers[block_id] = {
-                'full_content': '',
+                # Only the last max_lines lines are kept (the last one still growing), plus a
+                # count of every line seen, so memory and work per chunk stay bounded. Until the
+                # content first exceeds max_lines the display text is the whole content, so the
+                # tail is only built (from that text) once truncation starts
+                'tail': None,
+                'line_count': 1,
                 'last_display_content': '',
+                'updated_at': float('-inf'),  # monotonic time of the last content change
                 'title': title
             }
             
-            # Create a panel for the display content
+            # Create a panel for the display content; its Text is kept and updated in place
+            text = Text(self.buffers[block_id]['last_display_content'])
             panel = Panel(
-                Text(self.buffers[block_id]['last_display_content']), 
+                text, 
                 title=title, 
                 border_style="blue",
                 height=self.max_lines + 2  # Add space for title and borders
             )
             
-            # Create Live display
-            live = Live(
-                panel,
-                console=self.console,
-                refresh_per_second=8,  # Update 8 times per second for smoother updates
-                transient=False
-            )
-            
             self.displays[block_id] = {
-                'live': live,
-                'panel': panel
+                'panel': panel,
+                'text': text
             }
+            self._group.renderables.append(panel)
             
-            # Start the live display
-            live.start()
+            # Start the shared live display if this is the only panel
+            if self._live is None:
+                self._live = Live(
+                    self._group,
+                    console=self.console,
+                    refresh_per_second=8,  # Update 8 times per second for smoother updates
+                    transient=False
+                )
+                self._live.start()
     
     def update_content(self, block_id: str, new_content: str):
         """Add new content to a display and update it only if display content changed"""
         if block_id not in self.buffers:
             self.create_display(block_id, "Content")
         
-        # Append new content to the full content
-        self.buffers[block_id]['full_content'] += new_content
+        # Empty deltas (heartbeats) change nothing
+        if not new_content:
+            return
+        
+        buffer = self.buffers[block_id]
+        tail = buffer['tail']
         
-        # Split into lines and limit display
-        all_lines = self.buffers[block_id]['full_content'].split('\n')
+        if tail is None:
+            # Nothing truncated yet: while the content still fits, the display text is just
+            # the content so far plus the chunk - no tail bookkeeping at all
+            added_lines = new_content.count('\n')
+            if buffer['line_count'] + added_lines <= self.max_lines:
+                buffer['line_count'] += added_lines
+                self._set_display_content(block_id, buffer['last_display_content'] + new_content)
+                return
+            tail = buffer['tail'] = deque(buffer['last_display_content'].split('\n'), maxlen=self.max_lines)
         
-        if len(all_lines) > self.max_lines:
+        # Fast path: a chunk without a newline only extends the last line, which is always
+        # displayed (unless the omission marker replaced it), so the display text just grows
+        # by the chunk - no split, no join, no comparison
+        if '\n' not in new_content and (self.max_lines > 1 or buffer['line_count'] <= self.max_lines):
+            tail[-1] += new_content
+            self._set_display_content(block_id, buffer['last_display_content'] + new_content)
+            return
+        
+        # Split only the new chunk and push its lines into the bounded tail, instead of
+        # concatenating onto the full content and re-splitting it on every chunk
+        new_lines = new_content.split('\n')
+        tail[-1] += new_lines[0]
+        tail.extend(islice(new_lines, 1, None))
+        buffer['line_count'] += len(new_lines) - 1
+        
+        if buffer['line_count'] > self.max_lines:
             # Calculate truncated lines
-            lines_truncated = len(all_lines) - self.max_lines
-            recent_lines = all_lines[-self.max_lines:]
-            display_lines = [f"[dim][...{lines_truncated} lines omitted...][/dim]"] + recent_lines[1:]
+            lines_truncated = buffer['line_count'] - self.max_lines
+            display_lines = chain([DisplayStyles.omitted_marker(lines_truncated, dim=True)], islice(tail, 1, None))
         else:
-            display_lines = all_lines[:]
+            display_lines = tail
         
-        # Check if display content actually changed before updating
-        new_display_content = '\n'.join(display_lines)
+        # A chunk with a newline always changes the display (one more line shown, or a higher
+        # omitted count), so there is nothing to compare against the previous display text
+        self._set_display_content(block_id, '\n'.join(display_lines))
+    
+    def _set_display_content(self, block_id: str, display_content: str):
+        """Record the new display text and show it in the block's panel"""
+        buffer = self.buffers[block_id]
+        buffer['last_display_content'] = display_content
         
-        # Only update if the display content changed to reduce redraws
-        if new_display_content != self.buffers[block_id]['last_display_content']:
-            self.buffers[block_id]['last_display_content'] = new_display_content
+        # Update the live display by rewriting the Text inside its existing panel; the
+        # Live already renders that panel, so its next refresh picks the change up
+        if block_id in self.displays:
+            self.displays[block_id]['text'].plain = display_content
             
-            # Update the live display
-            if block_id in self.displays:
-                live_info = self.displays[block_id]
-                new_panel = Panel(
-                    Text(new_display_content), 
-                    title=self.buffers[block_id]['title'], 
-                    border_style="blue",
-                    height=self.max_lines + 2
-                )
-                live_info['live'].update(new_panel)
+            # The first change after a pause (or the very first chunk) is drawn right away so
+            # short outputs show up without lag; sustained streams are left to the 8 Hz refresh
+            now = time.monotonic()
+            if now - buffer['updated_at'] >= _IDLE_REFRESH_THRESHOLD and self._live is not None:
+                self._live.refresh()
+            buffer['updated_at'] = now
     
     def stop_display(self, block_id: str):
         """Stop the live display for a specific block"""
         if block_id in self.displays:
-            self.displays[block_id]['live'].stop()
-            del self.displays[block_id]
-            if block_id in self.buffers:
-                del self.buffers[block_id]
+            panel = self.displays.pop(block_id)['panel']
+            self.buffers.pop(block_id, None)
+            
+            if self.displays:
+                # Other panels are still streaming: take this one out of the live area and
+                # print its final state above it, where it stays on screen
+                self._group.renderables.remove(panel)
+                self.console.print(panel)
+            else:
+                # Last panel: stopping the Live leaves its final render on screen
+                self._live.stop()
+                self._live = None
+                self._group.renderables.clear()
     
     def has_display(self, block_id: str) -> bool:
         """Check if a display exists for the given block_id"""
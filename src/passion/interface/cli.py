@@ -21,29 +21,51 @@ class SlashCommandCompleter(Completer):
         if text.startswith('/'):
             yield from self.completer.get_completions(document, complete_event)
 
+# Help text, printed with a single write
+_HELP_TEXT = "\n".join([
+    "\nAvailable Commands:",
+    "  /help           Show this help message",
+    "  /status         Show agent status (model, message count)",
+    "  /exit, /quit    Exit the session",
+    "",
+])
+
 def print_help():
-    print("\nAvailable Commands:")
-    print("  /help           Show this help message")
-    print("  /status         Show agent status (model, message count)")
-    print("  /exit, /quit    Exit the session")
-    print("")
+    print(_HELP_TEXT)
+
+async def _cmd_exit(agent):
+    print("Passion: See you later! Keep that energy up!")
+    return False # Signal to stop loop
+
+async def _cmd_help(agent):
+    print_help()
+    return True
+
+async def _cmd_status(agent):
+    status = agent.get_status()
+    body = "\n".join(f"  {k.capitalize()}: {v}" for k, v in status.items())
+    print(f"\nAgent Status:\n{body}\n")
+    return True
+
+# Slash command -> coroutine that runs it and returns whether the loop should continue
+_COMMANDS = {
+    "/help": _cmd_help,
+    "/status": _cmd_status,
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+}
+
+# Autocompletion for the commands above, built once: the completers hold no per-session state.
+# The custom pattern includes '/' as part of the word, and the wrapper only completes after a slash
+_WORD_PATTERN = re.compile(r'^([a-zA-Z0-9_/]+)$')
+_COMMAND_COMPLETER = SlashCommandCompleter(WordCompleter(list(_COMMANDS), ignore_case=True, pattern=_WORD_PATTERN))
 
 async def handle_command(command, agent):
-    cmd = command.lower().strip()
-    if cmd in ["/exit", "/quit"]:
-        print("Passion: See you later! Keep that energy up!")
-        return False # Signal to stop loop
-    elif cmd == "/help":
-        print_help()
-    elif cmd == "/status":
-        status = agent.get_status()
-        print("\nAgent Status:")
-        for k, v in status.items():
-            print(f"  {k.capitalize()}: {v}")
-        print("")
-    else:
+    handler = _COMMANDS.get(command.lower().strip())
+    if handler is None:
         print(f"\nUnknown command: {command}. Type /help for available commands.\n")
-    return True # Signal to continue loop
+        return True # Signal to continue loop
+    return await handler(agent)
 
 async def run_console_loop(agent):
     """
@@ -68,15 +90,6 @@ async def run_console_loop(agent):
     print("Type '/help' for a list of commands.")
     print("Type '/exit' or '/quit' to end the session.\n")
 
-    # Define commands for autocompletion
-    commands = ['/help', '/status', '/exit', '/quit']
-    # Custom pattern to include '/' as part of the word
-    word_pattern = re.compile(r'^([a-zA-Z0-9_/]+)$')
-    base_completer = WordCompleter(commands, ignore_case=True, pattern=word_pattern)
-
-    # Wrap with conditional completer
-    command_completer = SlashCommandCompleter(base_completer)
-
     # Key bindings to prevent Enter from submitting when a completion is selected
     kb = KeyBindings()
 
@@ -89,7 +102,7 @@ async def run_console_loop(agent):
 
     # Create a prompt session with history support and live autocompletion
     session = PromptSession(
-        completer=command_completer,
+        completer=_COMMAND_COMPLETER,
         key_bindings=kb,
         complete_while_typing=True
     )
@@ -1,7 +1,135 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import time
 from pathlib import Path
 
+# Size of the log file's write buffer; records are written to disk in batches of up to this many bytes
+_LOG_BUFFER_SIZE = 65536
+
+# Maximum number of seconds a written record stays in the log file's buffer, whether or not
+# more records arrive
+_LOG_FLUSH_INTERVAL = 1.0
+
+# The log file is rotated once it reaches this size, keeping this many old files (passion.log.1, ...)
+_LOG_MAX_BYTES = 5 * 1024 * 1024
+_LOG_BACKUP_COUNT = 3
+
+# Background thread that writes queued records to the log file; replaced on every setup_logging call
+_listener = None
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the timestamp's date and time part once per second instead of
+    calling strftime for every record; only the milliseconds are formatted per record.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted time); replaced as a whole, since the console handler and the
+        # log writer thread share this formatter
+        self._time_cache = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached = self._time_cache
+        if cached[0] != second:
+            cached = self._time_cache = (second, time.strftime(self.default_time_format, self.converter(record.created)))
+        return self.default_msec_format % (cached[1], record.msecs)
+
+
+class _BufferedFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that doesn't flush after every record: the file is written through a
+    large buffer and flushed at most every _LOG_FLUSH_INTERVAL seconds, immediately for ERROR
+    and above, and when the handler is closed.
+    Records left in the buffer when logging goes quiet are written by flush_pending.
+    """
+    def __init__(self, filename, encoding=None):
+        self._last_flush = 0.0
+        self._flush_now = False
+        self._pending = False  # Whether records were written since the last flush
+        super().__init__(filename, maxBytes=_LOG_MAX_BYTES, backupCount=_LOG_BACKUP_COUNT, encoding=encoding)
+
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=_LOG_BUFFER_SIZE, encoding=self.encoding, errors=self.errors)
+        # Like the base class, never rotate something that isn't a regular file (a FIFO, /dev/null);
+        # checked once per open instead of for every record
+        self._rotatable = os.path.isfile(self.baseFilename)
+        return stream
+
+    def shouldRollover(self, record):
+        # The base class asks the text stream for its position (which flushes it) and stats the
+        # file for every record; the byte position of the binary buffer is enough here, even if
+        # it lags by the few KB the text layer hasn't handed down yet
+        if self.stream is None:
+            self.stream = self._open()
+        return self._rotatable and self.stream.buffer.tell() >= self.maxBytes
+
+    def emit(self, record):
+        self._flush_now = record.levelno >= logging.ERROR
+        self._pending = True
+        super().emit(record)
+
+    def flush(self):
+        # Called by StreamHandler.emit after every record, and by logging.shutdown
+        now = time.monotonic()
+        if self._flush_now or now - self._last_flush >= _LOG_FLUSH_INTERVAL:
+            super().flush()
+            self._last_flush = now
+            self._pending = False
+
+    def flush_pending(self):
+        """
+        Writes out records still held in the buffer, if any.
+        """
+        if self._pending:
+            self._flush_now = True
+            self.flush()
+
+    def close(self):
+        # Write out whatever is still buffered before the file is closed
+        self._flush_now = True
+        super().close()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that flushes its handlers' buffers whenever no record has arrived for
+    _LOG_FLUSH_INTERVAL seconds, so records logged just before the session goes idle still reach
+    the file even if the process is later killed without running atexit (e.g. by SIGHUP).
+    """
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=_LOG_FLUSH_INTERVAL)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush_pending()
+
+
+def _stop_listener():
+    """
+    Stops the log writer thread after it has written every queued record, and closes the log file.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+atexit.register(_stop_listener)
+
+
 def setup_logging(console_level: str = "ERROR", log_dir: Path = None):
     """
     Sets up logging for the application.
@@ -10,6 +138,8 @@ def setup_logging(console_level: str = "ERROR", log_dir: Path = None):
         console_level: The logging level for the console (DEBUG, INFO, WARNING, ERROR, CRITICAL).
         log_dir: The directory where the log file should be created.
     """
+    global _listener
+
     if log_dir is None:
         # Fallback if not provided, though main should provide it
         log_dir = Path.cwd()
@@ -30,16 +160,25 @@ def setup_logging(console_level: str = "ERROR", log_dir: Path = None):
     # Clear existing handlers to avoid duplicates
     if logger.hasHandlers():
         logger.handlers.clear()
+    _stop_listener()
 
     # Formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    formatter = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-    # File Handler (Always logs INFO and above)
+    # File Handler (Always logs INFO and above). Records are only put on a queue by the logging
+    # call; a background thread writes them to the file, so the agent never waits on disk I/O
     try:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = _BufferedFileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(logging.INFO)
+        logger.addHandler(queue_handler)
+
+        _listener = _FlushingQueueListener(log_queue, file_handler)
+        _listener.start()
     except Exception as e:
         print(f"Failed to setup file logging to {log_file}: {e}", file=sys.stderr)
 
@@ -19,30 +19,61 @@ from passion.utils.common import get_passion_dir
 from passion.interface.cli import run_console_loop
 from passion.tools.registry import get_registered_tools
 
+# Run the console loop on uvloop's event loop when it is installed (the "speedups" extra),
+# on asyncio's default loop otherwise; the asyncio API is the same for both
+try:
+    import uvloop
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    _loop_factory = None
+
 logger = logging.getLogger(__name__)
 
+# Warning printed by agentscope during init that is hidden from the user
+_SUPPRESSED_WARNING = "Unsupported block type thinking in the message, skipped."
+
+class _FilteredStderr(io.TextIOBase):
+    """
+    Forwards writes to the real stderr line by line, dropping lines that contain the
+    suppressed warning. Only an incomplete last line is ever held back.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self._partial = ""
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        lines = (self._partial + s).splitlines(keepends=True)
+        # Keep an unterminated last line until the rest of it arrives
+        self._partial = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            if _SUPPRESSED_WARNING not in line:
+                self._stream.write(line)
+        return len(s)
+
+    def flush(self):
+        self._stream.flush()
+
+    def close_filter(self):
+        """Write out a remaining unterminated line (unless it is the suppressed warning)"""
+        if self._partial and _SUPPRESSED_WARNING not in self._partial:
+            self._stream.write(self._partial + "\n")
+        self._partial = ""
+
 # Define a context manager to suppress specific warnings from agentscope to stderr
 @contextlib.contextmanager
 def suppress_agentscope_warnings():
     old_stderr = sys.stderr
-    # Use io.StringIO to capture stderr output
-    captured_stderr = io.StringIO()
-    sys.stderr = captured_stderr
+    # Filter stderr as it is written instead of capturing everything and filtering afterwards
+    filtered_stderr = _FilteredStderr(old_stderr)
+    sys.stderr = filtered_stderr
     try:
         yield
     finally:
         sys.stderr = old_stderr # Restore original stderr
-        # Get the captured output
-        output = captured_stderr.getvalue()
-        # Filter out specific warning patterns
-        filtered_output = []
-        for line in output.splitlines():
-            if "Unsupported block type thinking in the message, skipped." not in line:
-                filtered_output.append(line)
-        
-        # Write remaining output to original stderr
-        if filtered_output:
-            old_stderr.write("\n".join(filtered_output) + "\n")
+        filtered_stderr.close_filter()
 
 def main():
     parser = argparse.ArgumentParser(description="Passion AI Agent")
@@ -95,12 +126,13 @@ def main():
         toolkit=registered_tools,
         formatter=formatter,
         memory=memory,
-        max_iters=50 # Set a higher iteration limit
+        max_iters=50, # Set a higher iteration limit
+        cacheable_tools={"get_plan", "view_text_file"} # Read-only tools, safe to reuse until another tool runs
     )
 
     # Start the interactive console loop
     try:
-        asyncio.run(run_console_loop(passion))
+        asyncio.run(run_console_loop(passion), loop_factory=_loop_factory)
     except KeyboardInterrupt:
         print("\nGoodbye!")
 
@@ -1,3 +1,4 @@
+from itertools import islice
 from agentscope.tool import ToolResponse
 from pathlib import Path
 
@@ -16,11 +17,14 @@ def write_text_file(file_path: str, content: str, mode: str = 'w', encoding: str
         ToolResponse: A ToolResponse object indicating success or failure.
     """
     try:
-        # Ensure the directory exists
-        path_obj = Path(file_path)
-        path_obj.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            f = open(file_path, mode, encoding=encoding)
+        except FileNotFoundError:
+            # Create the missing directories only when the open fails, instead of a mkdir on every write
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            f = open(file_path, mode, encoding=encoding)
         
-        with open(file_path, mode, encoding=encoding) as f:
+        with f:
             f.write(content)
         return ToolResponse(content=f"Successfully wrote content to {file_path}")
     except Exception as e:
@@ -39,26 +43,22 @@ def view_text_file(file_path: str, line_start: int = 1, line_end: int = -1) -> T
         ToolResponse: A ToolResponse object containing the file content or an error message.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        total_lines = len(lines)
-        
         # Adjust 0-based indexing
         start_idx = max(0, line_start - 1)
-        end_idx = total_lines if line_end == -1 else min(total_lines, line_end)
         
-        if start_idx >= total_lines:
-            return ToolResponse(content=f"Error: Line start {line_start} is beyond file end (total {total_lines} lines).")
-        if start_idx >= end_idx and line_end != -1: # if line_end is 1 for line_start 1, still valid.
-            return ToolResponse(content=f"Error: Line start {line_start} is after line end {line_end}.")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Read only up to the last requested line instead of the whole file, formatting each
+            # line with its number as it is read (rstrip removes the newline kept by the file iterator)
+            selected_lines = islice(f, start_idx, None if line_end == -1 else max(0, line_end))
+            formatted_content = [f"{line_no}: {line.rstrip()}" for line_no, line in enumerate(selected_lines, start_idx + 1)]
             
-        selected_lines = lines[start_idx:end_idx]
-        
-        # Format with line numbers
-        formatted_content = []
-        for i, line in enumerate(selected_lines):
-            formatted_content.append(f"{start_idx + i + 1}: {line.rstrip()}") # rstrip to remove extra newlines from readlines
+            if not formatted_content:
+                # Only now is the total line count needed, for the error message
+                f.seek(0)
+                total_lines = sum(1 for _ in f)
+                if start_idx >= total_lines:
+                    return ToolResponse(content=f"Error: Line start {line_start} is beyond file end (total {total_lines} lines).")
+                return ToolResponse(content=f"Error: Line start {line_start} is after line end {line_end}.")
             
         return ToolResponse(content=f"The content of {file_path}:\n```\n" + "\n".join(formatted_content) + "\n```")
     except FileNotFoundError:
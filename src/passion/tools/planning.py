@@ -1,37 +1,54 @@
 from agentscope.tool import ToolResponse
 
+# Status icon indexed by a task's completed flag (0 = pending, 1 = completed)
+_STATUS_ICONS = ("⬜", "✅")
+
 class PlanManager:
     def __init__(self):
-        self.tasks = []
+        # Tasks are kept as parallel arrays, one entry per task, instead of a dict per task
+        self._descriptions: list[str] = []
+        self._completed = bytearray()
+        self._results: list[str] = []
+        # Rendered plan, reused until the next change to the tasks
+        self._cached_render: str | None = None
 
     def create_plan(self, tasks: list[str]) -> str:
-        self.tasks = [{"description": t, "status": "pending"} for t in tasks]
+        self._descriptions = list(tasks)
+        self._completed = bytearray(len(self._descriptions))
+        self._results = [""] * len(self._descriptions)
+        self._cached_render = None
         return self._render_plan()
 
     def mark_task_completed(self, task_index: int, result: str = "") -> str:
-        if 0 <= task_index < len(self.tasks):
-            self.tasks[task_index]["status"] = "completed"
-            self.tasks[task_index]["result"] = result
+        if 0 <= task_index < len(self._descriptions):
+            self._completed[task_index] = 1
+            self._results[task_index] = result
+            self._cached_render = None
             return f"Task {task_index+1} marked as completed.\n" + self._render_plan()
         return f"Error: Invalid task index {task_index+1}."
 
     def add_task(self, description: str) -> str:
-        self.tasks.append({"description": description, "status": "pending"})
+        self._descriptions.append(description)
+        self._completed.append(0)
+        self._results.append("")
+        self._cached_render = None
         return f"Task added.\n" + self._render_plan()
 
     def get_plan(self) -> str:
-        if not self.tasks:
+        if not self._descriptions:
             return "No plan active."
         return self._render_plan()
 
     def _render_plan(self) -> str:
+        if self._cached_render is not None:
+            return self._cached_render
         output = ["Current Plan:"]
-        for i, task in enumerate(self.tasks):
-            status_icon = "✅" if task["status"] == "completed" else "⬜"
-            output.append(f"{i+1}. {status_icon} {task['description']}")
-            if task.get("result"):
-                output.append(f"   Result: {task['result']}")
-        return "\n".join(output)
+        for i, (description, completed, result) in enumerate(zip(self._descriptions, self._completed, self._results), 1):
+            output.append(f"{i}. {_STATUS_ICONS[completed]} {description}")
+            if result:
+                output.append(f"   Result: {result}")
+        self._cached_render = "\n".join(output)
+        return self._cached_render
 
 _PLAN_MANAGER = PlanManager()
 
@@ -1,5 +1,9 @@
+from functools import lru_cache
 from pathlib import Path
 
+# Both lookups only depend on where the package is installed and on directories that don't
+# move during a run, so each is resolved once per process (call .cache_clear() to redo it)
+@lru_cache(maxsize=1)
 def find_project_root(marker_file="pyproject.toml"):
     """
     Finds the project root by searching for a marker file in parent directories.
@@ -14,6 +18,7 @@ def find_project_root(marker_file="pyproject.toml"):
     # Avoid printing here as it might interfere with log level settings later
     return Path.cwd()
 
+@lru_cache(maxsize=1)
 def get_passion_dir() -> Path:
     """
     Returns the path to the .passion directory.
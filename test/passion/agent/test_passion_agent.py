@@ -7,7 +7,12 @@ import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from passion.agent.passion_agent import PassionAgent
-from agentscope.message import Msg
+from agentscope.message import Msg, TextBlock
+from agentscope.memory import InMemoryMemory
+from agentscope.model import ChatResponse
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.tool import Toolkit, ToolResponse
+from passion.tools.registry import get_registered_tools
 
 
 class MockLLM:
@@ -59,5 +64,197 @@ async def test_streaming_functionality():
     print("The PassionAgent is ready for streaming output.")
 
 
+@pytest.mark.asyncio
+async def test_quiet_agent_skips_display():
+    """A quiet agent never touches the display handler"""
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=MockLLM(),
+        quiet=True,
+    )
+    agent.display_handler = MagicMock()
+
+    msg = Msg(name="assistant", role="assistant", content="Hello")
+    await agent.print(msg, last=True)
+
+    agent.display_handler.handle.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_observe_prints_and_stores_messages():
+    """observe displays every observed message, then stores it in memory"""
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=MockLLM(),
+        memory=InMemoryMemory(),
+    )
+    agent.display_handler = MagicMock()
+
+    msgs = [Msg(name="User", role="user", content=f"note {i}") for i in range(3)]
+    await agent.observe(msgs)
+    assert [call.args[0] for call in agent.display_handler.handle.call_args_list] == msgs
+
+    # A single message is accepted too, and None is a no-op
+    await agent.observe(Msg(name="User", role="user", content="note 3"))
+    await agent.observe(None)
+    assert agent.display_handler.handle.call_count == 4
+    assert len(await agent.memory.get_memory()) == 4
+    assert agent._msg_count == 4
+
+
+def test_get_status():
+    """get_status works on a fresh agent and reports the tool count"""
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=MockLLM(),
+        toolkit=get_registered_tools(),
+        formatter=MagicMock(),
+    )
+
+    status = agent.get_status()
+    assert status["name"] == "TestPassion"
+    assert status["messages_processed"] == 0
+    assert status["tools_registered"] == len(agent.toolkit.get_json_schemas())
+
+
+@pytest.mark.asyncio
+async def test_status_follows_memory():
+    """messages_processed counts whatever is in memory, however it got there"""
+    async def model(prompt, tools=None, **kwargs):
+        return ChatResponse(content=[TextBlock(type="text", text="Hi")])
+    llm = AsyncMock(side_effect=model)
+    llm.stream = False
+
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=llm,
+        toolkit=Toolkit(),
+        formatter=OpenAIChatFormatter(),
+        quiet=True,
+    )
+
+    # User input, the reply and an observed message all land in memory
+    await agent(Msg(name="User", role="user", content="Hello"))
+    await agent.observe(Msg(name="Other", role="assistant", content="Hi all"))
+    assert agent.get_status()["messages_processed"] == await agent.memory.size() == 3
+
+    # Clearing the memory is picked up by the next call
+    await agent.memory.clear()
+    await agent(Msg(name="User", role="user", content="Again"))
+    assert agent.get_status()["messages_processed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reply_batch():
+    """reply_batch answers every message with its own LLM call, in order"""
+    mock_llm = AsyncMock()
+    mock_llm.stream = False
+    mock_llm.side_effect = lambda prompt, tools=None: MagicMock(content=[{"type": "text", "text": prompt[-1]}])
+    mock_formatter = MagicMock()
+    mock_formatter.format = AsyncMock(side_effect=lambda msgs: [m.content for m in msgs])
+
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=mock_llm,
+        formatter=mock_formatter,
+        quiet=True,
+    )
+
+    msgs = [Msg(name="User", role="user", content=f"question {i}") for i in range(5)]
+    replies = await agent.reply_batch(msgs, max_concurrency=2)
+
+    assert [r.get_text_content() for r in replies] == [f"question {i}" for i in range(5)]
+    assert mock_llm.await_count == 5
+    # Every prompt starts with the shared system message
+    assert all(call.kwargs["msgs"][0] is agent._sys_msg for call in mock_formatter.format.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tool_results_are_reused():
+    """Identical calls to a cacheable tool run it once, until another tool runs"""
+    calls = []
+
+    def read_value(key: str) -> ToolResponse:
+        """Read a value.
+
+        Args:
+            key (str): The key to read.
+        """
+        calls.append(key)
+        return ToolResponse(content=[TextBlock(type="text", text=f"value of {key}")])
+
+    def write_value(key: str) -> ToolResponse:
+        """Write a value.
+
+        Args:
+            key (str): The key to write.
+        """
+        return ToolResponse(content=[TextBlock(type="text", text="ok")])
+
+    toolkit = Toolkit()
+    toolkit.register_tool_function(read_value)
+    toolkit.register_tool_function(write_value)
+
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=MagicMock(),
+        toolkit=toolkit,
+        formatter=MagicMock(),
+        memory=InMemoryMemory(),
+        quiet=True,
+        cacheable_tools={"read_value"},
+    )
+
+    read = {"type": "tool_use", "id": "1", "name": "read_value", "input": {"key": "a"}}
+    await agent._acting(read)
+    await agent._acting(dict(read, id="2"))
+    assert calls == ["a"]
+
+    # Every call still records its own result in memory
+    history = await agent.memory.get_memory()
+    assert [m.content[0]["id"] for m in history] == ["1", "2"]
+    assert history[1].content[0]["output"][0]["text"] == "value of a"
+
+    # A non-cacheable tool invalidates what was read before
+    await agent._acting({"type": "tool_use", "id": "3", "name": "write_value", "input": {"key": "a"}})
+    await agent._acting(dict(read, id="4"))
+    assert calls == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_cached_string_output_is_reused_as_is():
+    """A cached tool that returns a plain string records the same string again"""
+    def read_note() -> ToolResponse:
+        """Read the note."""
+        return ToolResponse(content="Note: nothing planned")
+
+    toolkit = Toolkit()
+    toolkit.register_tool_function(read_note)
+
+    agent = PassionAgent(
+        name="TestPassion",
+        sys_prompt="You are a helpful assistant.",
+        llm=MagicMock(),
+        toolkit=toolkit,
+        formatter=MagicMock(),
+        memory=InMemoryMemory(),
+        quiet=True,
+        cacheable_tools={"read_note"},
+    )
+
+    call = {"type": "tool_use", "id": "1", "name": "read_note", "input": {}}
+    await agent._acting(call)
+    await agent._acting(dict(call, id="2"))
+
+    history = await agent.memory.get_memory()
+    assert [m.content[0]["output"] for m in history] == ["Note: nothing planned"] * 2
+
+
 if __name__ == "__main__":
     asyncio.run(test_streaming_functionality())
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Test script to verify config lookup and caching in load_config.
+"""
+import json
+import pytest
+from pathlib import Path
+from passion.config import loader
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A fake project root and home directory, with the load_config cache cleared around the test"""
+    monkeypatch.setattr(loader, "find_project_root", lambda: tmp_path / "project")
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    loader.load_config.cache_clear()
+    yield tmp_path
+    loader.load_config.cache_clear()
+
+
+def write_config(path: Path, model: dict):
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"model": model}), encoding="utf-8")
+
+
+def test_project_config_takes_priority(project):
+    """The project .passion config wins over the home one"""
+    write_config(project / "project" / ".passion" / "config.json", {"model_name": "project"})
+    write_config(project / "home" / ".passion" / "config.json", {"model_name": "home"})
+
+    assert loader.load_config() == {"model_name": "project"}
+
+
+def test_config_is_parsed_once(project):
+    """Later calls return the cached config without reading the file again"""
+    config_path = project / "home" / ".passion" / "config.json"
+    write_config(config_path, {"model_name": "home"})
+
+    first = loader.load_config()
+    config_path.unlink()
+    assert loader.load_config() is first
+
+
+def test_missing_config_exits(project):
+    """Without any config file the CLI exits"""
+    with pytest.raises(SystemExit):
+        loader.load_config()
+
+
+def test_invalid_json_exits(project):
+    """A config that is not valid JSON makes the CLI exit, whichever parser is used"""
+    config_path = project / "project" / ".passion" / "config.json"
+    config_path.parent.mkdir(parents=True)
+    config_path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        loader.load_config()
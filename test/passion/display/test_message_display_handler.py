@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+"""
+Test script to verify the streaming text logic of MessageDisplayHandler
+without a real terminal.
+"""
+import io
+import os
+import signal
+import pytest
+from rich.console import Console
+from agentscope.message import Msg
+from passion.display import MessageDisplayHandler
+from passion.display.components import message_display_handler
+
+
+def make_handler():
+    """Create a handler that renders into an in-memory console"""
+    handler = MessageDisplayHandler(name="TestPassion")
+    handler.console = Console(file=io.StringIO(), width=80, color_system=None)
+    return handler
+
+
+def get_output(handler):
+    return handler.console.file.getvalue()
+
+
+def test_text_is_streamed_as_deltas():
+    """Only the new part of a growing text block is written"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content=[{"type": "text", "text": "Hello"}])
+    handler.handle_text_display(msg)
+
+    msg.content = [{"type": "text", "text": "Hello, world"}]
+    handler.handle_text_display(msg)
+    handler.handle_final_cleanup(msg, last=True)
+
+    output = get_output(handler)
+    assert output.count("TestPassion:") == 1
+    assert "Hello, world" in output
+    assert output.count("Hello") == 1
+
+
+def test_multiple_text_blocks_are_tracked_separately():
+    """A second text block is not sliced with the length of the first one"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content=[
+        {"type": "text", "text": "First block. "},
+        {"type": "text", "text": "Second"},
+    ])
+    handler.handle_text_display(msg)
+    handler.handle_final_cleanup(msg, last=True)
+
+    output = get_output(handler)
+    assert "First block. Second" in output
+
+
+def test_handle_dispatches_and_cleans_up():
+    """handle() renders every block type in one pass and finishes the message"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content=[
+        {"type": "text", "text": "Let me check."},
+        {"type": "tool_result", "id": "call_1", "name": "execute_shell_command", "output": "done"},
+    ])
+    handler.handle(msg, last=True)
+
+    output = get_output(handler)
+    assert "Let me check." in output
+    assert "execute_shell_command executed" in output
+    assert msg.id in handler._finished_msg_ids
+
+    # A finished message is never rendered again
+    handler.handle(msg, last=True)
+    assert get_output(handler) == output
+
+
+def test_plan_result_from_text_blocks():
+    """Tool outputs given as agentscope text blocks are rendered as text, not as a repr"""
+    handler = make_handler()
+    output = [{"type": "text", "text": "Current Plan:\n1. ✅ Write code\n2. ⬜ Test code"}]
+    handler.emit_tool_result("call_1", "get_plan", output)
+
+    rendered = get_output(handler)
+    assert "Write code" in rendered
+    assert "Test code" in rendered
+    assert "'type'" not in rendered
+
+
+def test_plan_result_skips_non_task_lines():
+    """Only numbered task lines of the plan are shown, split into icon and description"""
+    handler = make_handler()
+    output = "Task 1 marked as completed.\nCurrent Plan:\n1. ✅ Write code\n   Result: done\n2. ⬜ Test code"
+    handler.emit_tool_result("call_1", "mark_task_completed", output)
+
+    rendered = get_output(handler)
+    assert "✅ Write code" in rendered
+    assert "⬜ Test code" in rendered
+    assert "marked as completed" not in rendered
+    assert "Result: done" not in rendered
+
+
+def test_tool_output_text_joins_text_and_raw_string_blocks():
+    """Text blocks and bare strings of a tool output are joined; other blocks are skipped"""
+    output = [{"type": "text", "text": "a"}, "b", {"type": "image", "url": "x"}, {"type": "text"}, {"type": "text", "text": "c"}]
+    assert message_display_handler._output_to_text(output) == "abc"
+    assert message_display_handler._output_to_text("plain") == "plain"
+    assert message_display_handler._output_to_text(None) == ""
+
+
+def test_raw_string_blocks_are_rendered_as_text():
+    """Bare strings inside a content list are treated like text blocks"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content=["Hello ", {"type": "text", "text": "world"}])
+    handler.handle(msg, last=True)
+
+    assert "Hello world" in get_output(handler)
+
+
+def test_text_deltas_are_buffered_until_flush():
+    """Deltas without a newline are held back briefly, and flushed before anything else"""
+    handler = make_handler()
+    handler._last_text_flush = float("inf")  # Never flush on time in this test
+    msg = Msg(name="assistant", role="assistant", content="partial [b]answer[/b]")
+    handler.handle_text_display(msg)
+    assert "partial" not in get_output(handler)
+
+    handler.handle_final_cleanup(msg, last=True)
+    assert "partial [b]answer[/b]" in get_output(handler)
+
+
+def test_whitespace_deltas_wait_for_visible_text():
+    """A whitespace-only delta, even a newline, is written together with the next visible text"""
+    handler = make_handler()
+    handler._emit("Hello")
+    handler._flush_text()
+    handler._emit("\n\n")
+    assert get_output(handler) == "Hello"
+
+    handler._emit("World\n")
+    assert get_output(handler) == "Hello\n\nWorld\n"
+
+
+def test_tool_inputs_are_bounded():
+    """Inputs of old tool calls are evicted once too many calls have been seen"""
+    handler = make_handler()
+    limit = message_display_handler._MAX_TRACKED_TOOLS
+    for i in range(limit + 10):
+        handler.emit_tool_use({"id": f"call_{i}", "name": "get_plan", "input": {"n": i}})
+    handler._stop_status_spinner()
+
+    assert len(handler._tool_inputs) == limit
+    assert "call_0" not in handler._tool_inputs
+    assert handler._tool_inputs[f"call_{limit + 9}"] == {"n": limit + 9}
+
+
+def test_seen_ids_are_bounded():
+    """Finished messages and printed tool calls are only remembered up to a fixed limit"""
+    handler = make_handler()
+    handler._finished_msg_ids.maxlen = handler._printed_tool_ends.maxlen = 3
+    msgs = [Msg(name="assistant", role="assistant", content=f"reply {i}") for i in range(5)]
+    for i, msg in enumerate(msgs):
+        handler.emit_tool_result(f"call_{i}", "execute_shell_command", "ok")
+        handler.handle(msg, last=True)
+
+    assert list(handler._finished_msg_ids) == [msg.id for msg in msgs[2:]]
+    assert list(handler._printed_tool_ends) == ["call_2", "call_3", "call_4"]
+    # A recently finished message is still never rendered again
+    output = get_output(handler)
+    handler.handle(msgs[-1], last=True)
+    assert get_output(handler) == output
+
+
+def test_plain_separator_matches_rule():
+    """Without colors the separator is written directly, looking exactly like the Rule it replaces"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content="done")
+    handler.handle(msg, last=True)
+
+    expected = Console(file=io.StringIO(), width=80, color_system=None)
+    expected.print(handler._separator)
+    assert get_output(handler).endswith(expected.file.getvalue())
+
+
+def test_legacy_windows_separator_uses_rule():
+    """Legacy Windows consoles don't understand raw ANSI, so the separator goes through the Rule"""
+    handler = make_handler()
+    handler.console = Console(file=io.StringIO(), width=80, force_terminal=True, color_system="windows", legacy_windows=True)
+    printed = []
+    handler.console.print = lambda *objects, **kwargs: printed.extend(objects)
+
+    handler.handle(Msg(name="assistant", role="assistant", content="done"), last=True)
+
+    assert handler._separator in printed
+    assert "\x1b" not in handler.console.file.getvalue()
+
+
+def test_streaming_panel_shows_latest_input_when_stopped():
+    """Panel renders are throttled, but the panel always ends with the latest tool input"""
+    handler = make_handler()
+    code = ""
+    for i in range(20):
+        code += f"print({i})\n"
+        handler.emit_tool_use({"id": "call_1", "name": "execute_python_code", "input": {"code": code}})
+
+    # Updates arriving this fast are coalesced rather than rendered one by one
+    assert "call_1" in handler._pending_panels
+
+    handler.emit_tool_result("call_1", "execute_python_code", "ok")
+    assert "print(19)" in get_output(handler)
+    assert not handler._pending_panels
+
+
+def test_tail_lines_matches_splitlines():
+    """_tail_lines keeps the same last lines and hidden count as a full splitlines()"""
+    for content in ["", "a", "a\n", "a\nb\nc", "a\nb\nc\n", "a\n\nb\n\n", "x\r\ny\r\nz\r\n", "\n".join(map(str, range(50))),
+                    "10%\r50%\r100%\ndone\n", "a\rb\rc\rd", "a\nb\u2028c\fd\n"]:
+        for max_lines in (1, 2, 3, 8):
+            lines = content.splitlines()
+            display, hidden, start = message_display_handler._tail_lines(content, max_lines)
+            if len(lines) > max_lines:
+                assert display == "\n".join(lines[-max_lines:])
+                assert hidden == len(lines) - max_lines
+                assert start == hidden + 1
+            else:
+                assert (display, hidden, start) == (content, 0, 1)
+
+
+def test_panel_is_reused_while_visible_content_is_unchanged():
+    """Updates that don't change the visible tail of the panel reuse the same Panel"""
+    handler = make_handler()
+    code = "\n".join(f"print({i})" for i in range(20))
+    panel = handler._create_panel_renderable(code, "Python Code", "python")
+    assert handler._create_panel_renderable(code + "\n", "Python Code", "python") is panel
+    assert handler._create_panel_renderable(code + "\nx = 1", "Python Code", "python") is not panel
+
+
+def test_panel_content_is_capped():
+    """A huge single line is cut to its end, while the hidden line count stays exact"""
+    handler = make_handler()
+    limit = message_display_handler._MAX_PANEL_CHARS
+    content = "first\n" * 10 + "x" * (limit * 2)
+    panel = handler._create_panel_renderable(content, "Writing File", "markdown")
+
+    hidden, text = panel.renderable.renderables
+    assert "(8 lines hidden)" in hidden.plain
+    assert len(text.plain) == limit
+
+
+def test_long_code_is_not_highlighted():
+    """Code beyond the highlight limit is shown as numbered plain text instead of Syntax"""
+    handler = make_handler()
+    content = "a = 1\n" + "b = '" + "x" * message_display_handler._MAX_HIGHLIGHT_CHARS + "'"
+    panel = handler._create_panel_renderable(content, "Python Code", "python")
+
+    (text,) = panel.renderable.renderables
+    assert isinstance(text, message_display_handler.Text)
+    assert text.plain.startswith("   1  a = 1\n   2  b = 'x")
+
+
+def test_thinking_shows_last_non_empty_line():
+    """The spinner shows the last non-empty thinking line and skips updates that don't change it"""
+    handler = make_handler()
+    updates = []
+    handler._update_status_spinner = updates.append
+    handler.status_live = object()  # Pretend the spinner is running
+
+    msg = Msg(name="assistant", role="assistant", content=[{"type": "thinking", "thinking": "First idea\n  Second idea  \n\n"}])
+    handler.handle_thinking_display(msg)
+    msg.content[0]["thinking"] += "\n \n"
+    handler.handle_thinking_display(msg)
+
+    assert updates == ["Thinking: Second idea"]
+
+
+def test_content_is_normalized_once_per_content():
+    """Repeated handler calls on unchanged content reuse one normalized block list"""
+    handler = make_handler()
+    msg = Msg(name="assistant", role="assistant", content="hello")
+    first = handler._normalize_content(msg)
+    assert handler._normalize_content(msg) is first
+
+    msg.content = "hello world"
+    assert handler._normalize_content(msg)[0]["text"] == "hello world"
+
+
+def test_status_spinner_is_updated_in_place():
+    """Status updates change the text of the running spinner instead of replacing it"""
+    handler = make_handler()
+    handler._update_status_spinner("Running get_plan...")
+    spinner = handler._spinner
+    handler._update_status_spinner("Passion is analyzing results...")
+
+    assert handler._spinner is spinner
+    assert spinner.text.plain == " Passion is analyzing results..."
+
+    # Repeating the same status leaves the spinner untouched
+    text = spinner.text
+    handler._update_status_spinner("Passion is analyzing results...")
+    assert spinner.text is text
+
+    handler._stop_status_spinner()
+    assert handler._spinner is None
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGWINCH"), reason="needs SIGWINCH")
+def test_console_width_is_requeried_only_after_resize():
+    """With SIGWINCH watched, the width is cached until the terminal is resized"""
+    previous = signal.getsignal(signal.SIGWINCH)
+    signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+    try:
+        handler = make_handler()
+        assert handler._get_console_width() == 80
+        assert signal.getsignal(signal.SIGWINCH) is message_display_handler._on_sigwinch
+
+        handler.console.width = 100
+        assert handler._get_console_width() == 80
+        os.kill(os.getpid(), signal.SIGWINCH)
+        assert handler._get_console_width() == 100
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+"""
+Test script to verify SimpleLineLimiter keeps the tail of long content.
+"""
+from passion.display import SimpleLineLimiter
+
+
+def test_short_content_is_unchanged():
+    """Content within the limit is returned as is"""
+    limiter = SimpleLineLimiter(max_lines=3)
+    assert limiter.apply_limit("") == ""
+    assert limiter.apply_limit("a\nb\nc") == "a\nb\nc"
+
+
+def test_long_content_keeps_the_tail():
+    """Only the last lines are kept, with the first one replaced by an omission marker"""
+    limiter = SimpleLineLimiter(max_lines=3)
+    content = "\n".join(f"line {i}" for i in range(10))
+
+    assert limiter.apply_limit(content) == "[...7 lines omitted...]\nline 8\nline 9"
+    assert limiter.apply_limit("a\nb\nc\nd") == "[...1 lines omitted...]\nc\nd"
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Tests for StreamDisplayManager line limiting, rendered to an in-memory console.
+"""
+import io
+from rich.console import Console
+from passion.display import StreamDisplayManager
+
+
+def make_manager(max_lines: int = 3) -> StreamDisplayManager:
+    manager = StreamDisplayManager(max_lines=max_lines)
+    manager.console = Console(file=io.StringIO(), width=80, color_system=None)
+    return manager
+
+
+def test_short_content_is_shown_in_full():
+    """Content within the line limit is displayed as is, across chunk boundaries"""
+    manager = make_manager()
+    manager.update_content("block", "first li")
+    manager.update_content("block", "ne\nsecond")
+
+    assert manager.buffers["block"]["last_display_content"] == "first line\nsecond"
+    manager.stop_display("block")
+
+
+def test_long_content_keeps_only_the_tail():
+    """Only the last lines are kept, with a marker counting the omitted ones"""
+    manager = make_manager()
+    for i in range(10):
+        manager.update_content("block", f"line {i}\n")
+
+    buffer = manager.buffers["block"]
+    assert len(buffer["tail"]) == 3
+    assert manager.displays["block"]["panel"].renderable.plain == buffer["last_display_content"]
+    assert buffer["last_display_content"] == "[dim][...8 lines omitted...][/dim]\nline 9\n"
+    manager.stop_display("block")
+
+
+def test_displays_share_one_live():
+    """Concurrent displays are rendered by one Live, which stops with the last display"""
+    manager = make_manager()
+    manager.create_display("a", "Tool A")
+    live = manager._live
+    manager.create_display("b", "Tool B")
+    assert manager._live is live
+    assert len(manager._group.renderables) == 2
+
+    manager.update_content("a", "output of a")
+    manager.stop_display("a")
+    assert manager._live is live
+    assert len(manager._group.renderables) == 1
+    assert "output of a" in manager.console.file.getvalue()
+
+    manager.stop_display("b")
+    assert manager._live is None
+    assert not manager.has_display("b")
+
+
+def test_chunks_without_newline_extend_the_last_line():
+    """Chunks that only grow the last line are shown, truncated or not; empty chunks are ignored"""
+    manager = make_manager()
+    for i in range(5):
+        manager.update_content("block", f"line {i}\n")
+    manager.update_content("block", "")
+    manager.update_content("block", "par")
+    manager.update_content("block", "tial")
+
+    assert manager.buffers["block"]["last_display_content"] == "[dim][...3 lines omitted...][/dim]\nline 4\npartial"
+    assert manager.displays["block"]["text"].plain == "[dim][...3 lines omitted...][/dim]\nline 4\npartial"
+    manager.stop_display("block")
+
+
+
+def test_first_change_after_a_pause_is_drawn_immediately():
+    """Only the first chunk after a pause forces a redraw; a burst waits for the Live's refresh"""
+    manager = make_manager()
+    manager.create_display("block", "Tool")
+    text = manager.displays["block"]["text"]
+    refreshes = []
+    manager._live.refresh = lambda: refreshes.append(text.plain)
+
+    manager.update_content("block", "first")
+    manager.update_content("block", " chunk")
+    assert refreshes == ["first"]
+
+    manager.buffers["block"]["updated_at"] -= 1  # Pretend the stream went quiet
+    manager.update_content("block", "\nagain")
+    assert refreshes == ["first", "first chunk\nagain"]
+    manager.stop_display("block")
+
+
+def test_display_matches_full_content_for_any_chunking():
+    """However the content is chunked, the display equals the last lines of the full content"""
+    content = "".join(f"line {i}\n" if i % 3 else f"part {i} " for i in range(30))
+    for max_lines in (1, 2, 3, 5, 40):
+        for size in (1, 2, 7, 50):
+            manager = make_manager(max_lines)
+            for start in range(0, len(content), size):
+                manager.update_content("block", content[start:start + size])
+
+            lines = content.split("\n")
+            if len(lines) > max_lines:
+                marker = f"[dim][...{len(lines) - max_lines} lines omitted...][/dim]"
+                expected = "\n".join([marker] + lines[len(lines) - max_lines + 1:])
+            else:
+                expected = content
+            assert manager.buffers["block"]["last_display_content"] == expected
+            manager.stop_display("block")
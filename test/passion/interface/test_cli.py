@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+Test script to verify slash command handling in the console interface.
+"""
+import pytest
+from passion.interface.cli import handle_command
+
+
+class FakeAgent:
+    def get_status(self):
+        return {"name": "Passion", "messages_processed": 3}
+
+
+@pytest.mark.asyncio
+async def test_commands_are_dispatched(capsys):
+    """Known commands run and report whether to continue; case and spaces don't matter"""
+    agent = FakeAgent()
+    assert await handle_command("/help", agent) is True
+    assert "/status" in capsys.readouterr().out
+
+    assert await handle_command(" /STATUS ", agent) is True
+    out = capsys.readouterr().out
+    assert "Name: Passion" in out
+    assert "Messages_processed: 3" in out
+
+    assert await handle_command("/quit", agent) is False
+    assert await handle_command("/exit", agent) is False
+
+
+@pytest.mark.asyncio
+async def test_unknown_command_continues(capsys):
+    """An unknown command is reported and the loop continues"""
+    assert await handle_command("/nope", FakeAgent()) is True
+    assert "Unknown command: /nope" in capsys.readouterr().out
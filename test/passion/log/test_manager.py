@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Test script to verify that setup_logging writes records to the log file in the background.
+"""
+import logging
+import os
+import time
+import pytest
+from passion.log import manager
+
+
+@pytest.fixture
+def root_logger():
+    """Restore the root logger's handlers and level after the test"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    manager._stop_listener()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_records_are_written_by_the_listener(tmp_path, root_logger):
+    """Records are queued and written to passion.log; everything is on disk once the listener stops"""
+    manager.setup_logging(console_level="CRITICAL", log_dir=tmp_path)
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers)
+
+    logging.getLogger("passion.test").info("hello from the test")
+    manager._stop_listener()
+
+    content = (tmp_path / "passion.log").read_text(encoding="utf-8")
+    assert "Logging initialized" in content
+    assert "passion.test - INFO - hello from the test" in content
+
+
+def test_errors_are_flushed_immediately(tmp_path, root_logger):
+    """ERROR records reach the file without waiting for the flush interval"""
+    manager.setup_logging(console_level="CRITICAL", log_dir=tmp_path)
+    logging.getLogger("passion.test").error("something broke")
+
+    # Well within the flush interval, so only the immediate ERROR flush can have written it
+    deadline = time.monotonic() + manager._LOG_FLUSH_INTERVAL / 2
+    log_file = tmp_path / "passion.log"
+    while not log_file.exists() or "something broke" not in log_file.read_text(encoding="utf-8"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_idle_records_are_flushed(tmp_path, root_logger, monkeypatch):
+    """An INFO record reaches the file within the flush interval even if nothing else is logged"""
+    monkeypatch.setattr(manager, "_LOG_FLUSH_INTERVAL", 0.1)
+    manager.setup_logging(console_level="CRITICAL", log_dir=tmp_path)
+    logging.getLogger("passion.test").info("last words")
+
+    # The listener is still running: only its idle flush can have written the record
+    deadline = time.monotonic() + 2
+    log_file = tmp_path / "passion.log"
+    while not log_file.exists() or "last words" not in log_file.read_text(encoding="utf-8"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_timestamps_match_the_standard_formatter():
+    """The cached timestamp renders exactly like logging.Formatter's"""
+    fmt = "%(asctime)s - %(message)s"
+    cached, standard = manager._CachedTimeFormatter(fmt), logging.Formatter(fmt)
+    for created in (1700000000.123, 1700000000.987, 1700000001.5):
+        record = logging.makeLogRecord({"msg": "x", "created": created, "msecs": (created % 1) * 1000})
+        assert cached.format(record) == standard.format(record)
+
+
+def test_log_file_is_rotated(tmp_path, monkeypatch):
+    """Once the file reaches its size limit, it is rotated to passion.log.1"""
+    monkeypatch.setattr(manager, "_LOG_MAX_BYTES", 200)
+    handler = manager._BufferedFileHandler(tmp_path / "passion.log", encoding="utf-8")
+    # The size check lags by what the text layer still buffers (a few KB), so write well past that
+    for i in range(500):
+        handler.emit(logging.makeLogRecord({"msg": f"record number {i} " + "x" * 50, "levelno": logging.INFO}))
+    handler.close()
+
+    assert (tmp_path / "passion.log.1").exists()
+    assert "record number 499" in (tmp_path / "passion.log").read_text(encoding="utf-8")
+
+
+def test_non_regular_file_is_not_rotated(tmp_path, monkeypatch):
+    """A log path pointing at something other than a regular file (here /dev/null) is never rotated"""
+    monkeypatch.setattr(manager, "_LOG_MAX_BYTES", 200)
+    (tmp_path / "passion.log").symlink_to(os.devnull)
+    handler = manager._BufferedFileHandler(tmp_path / "passion.log", encoding="utf-8")
+    for i in range(500):
+        handler.emit(logging.makeLogRecord({"msg": f"record number {i} " + "x" * 50, "levelno": logging.INFO}))
+    handler.close()
+
+    assert (tmp_path / "passion.log").is_symlink()
+    assert not (tmp_path / "passion.log.1").exists()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+"""
+Test script to verify that agentscope's init warning is filtered out of stderr.
+"""
+import io
+import sys
+from passion import main
+
+
+def test_suppressed_warning_is_filtered_line_by_line(monkeypatch):
+    """Other stderr lines pass through, even when lines are split across writes"""
+    stderr = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stderr)
+    warning = "Unsupported block type thinking in the message, skipped."
+
+    with main.suppress_agentscope_warnings():
+        sys.stderr.write(f"keep 1\n{warning}\nkee")
+        assert stderr.getvalue() == "keep 1\n"  # Passed through as soon as the line is complete
+        sys.stderr.write(f"p 2\n{warning[:10]}")
+        sys.stderr.write(f"{warning[10:]}\nlast")
+
+    assert sys.stderr is stderr
+    assert stderr.getvalue() == "keep 1\nkeep 2\nlast\n"
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""
+Test script to verify the file tools: line ranges and errors of view_text_file, and write_text_file.
+"""
+from passion.tools.file_tools import view_text_file, write_text_file
+
+
+def make_file(tmp_path, content: str) -> str:
+    path = tmp_path / "sample.txt"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_line_range_is_numbered(tmp_path):
+    """The requested range is returned with 1-based line numbers"""
+    path = make_file(tmp_path, "a\nb\nc\nd\n")
+    assert view_text_file(path, 2, 3).content == f"The content of {path}:\n```\n2: b\n3: c\n```"
+    assert view_text_file(path, 3).content == f"The content of {path}:\n```\n3: c\n4: d\n```"
+    assert view_text_file(path, 1, 100).content.endswith("1: a\n2: b\n3: c\n4: d\n```")
+
+
+def test_out_of_range_errors(tmp_path):
+    """Starts past the end report the total line count; inverted ranges are rejected"""
+    path = make_file(tmp_path, "a\nb\nc")
+    assert view_text_file(path, 5).content == "Error: Line start 5 is beyond file end (total 3 lines)."
+    assert view_text_file(path, 3, 2).content == "Error: Line start 3 is after line end 2."
+    assert view_text_file(str(tmp_path / "missing.txt")).content == f"Error: The file {tmp_path / 'missing.txt'} does not exist."
+
+
+def test_write_creates_missing_directories(tmp_path):
+    """Writing into a directory that doesn't exist yet creates it; appending adds to the file"""
+    path = tmp_path / "new" / "dir" / "out.txt"
+    assert write_text_file(str(path), "a").content == f"Successfully wrote content to {path}"
+    write_text_file(str(path), "b", mode="a")
+    assert path.read_text(encoding="utf-8") == "ab"
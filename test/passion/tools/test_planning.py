@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""
+Test script to verify plan rendering and updates of PlanManager.
+"""
+from passion.tools.planning import PlanManager
+
+
+def test_plan_lifecycle():
+    """Tasks are created, completed with results and appended, and rendered in order"""
+    manager = PlanManager()
+    assert manager.get_plan() == "No plan active."
+
+    assert manager.create_plan(["a", "b"]) == "Current Plan:\n1. ⬜ a\n2. ⬜ b"
+    assert manager.mark_task_completed(1, "did b") == "Task 2 marked as completed.\nCurrent Plan:\n1. ⬜ a\n2. ✅ b\n   Result: did b"
+    assert manager.add_task("c") == "Task added.\nCurrent Plan:\n1. ⬜ a\n2. ✅ b\n   Result: did b\n3. ⬜ c"
+    assert manager.mark_task_completed(0) == "Task 1 marked as completed.\nCurrent Plan:\n1. ✅ a\n2. ✅ b\n   Result: did b\n3. ⬜ c"
+
+
+def test_invalid_task_index():
+    """Out-of-range indexes are rejected without changing the plan"""
+    manager = PlanManager()
+    manager.create_plan(["a"])
+    assert manager.mark_task_completed(1) == "Error: Invalid task index 2."
+    assert manager.mark_task_completed(-1) == "Error: Invalid task index 0."
+    assert manager.get_plan() == "Current Plan:\n1. ⬜ a"
+
+
+def test_rendered_plan_is_reused_until_changed():
+    """Repeated get_plan calls reuse the rendered plan; any change renders it again"""
+    manager = PlanManager()
+    manager.create_plan(["a"])
+    first = manager.get_plan()
+    assert manager.get_plan() is first
+
+    manager.mark_task_completed(0)
+    assert manager.get_plan() == "Current Plan:\n1. ✅ a"